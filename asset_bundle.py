@@ -0,0 +1,188 @@
+# asset_bundle.py
+# Pacote de imagens já escaladas e no formato de pixel da tela, gerado offline:
+#   python asset_bundle.py            # grava assets/assets.bundle (no próprio painel)
+# No boot, load_assets() mapeia o arquivo e copia os pixels direto para Surfaces,
+# sem decodificar PNG nem escalar. Sem o arquivo (ou se ele não servir), cada imagem
+# volta a ser carregada do PNG, como antes.
+import ctypes
+import mmap
+import os
+
+import pygame
+
+MAGIC = b"UTFASSET"
+VERSION = 1
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(_BASE_DIR, "assets", "images")
+BUNDLE_PATH = os.path.join(_BASE_DIR, "assets", "assets.bundle")
+
+class BundleHeader(ctypes.LittleEndianStructure):
+    """Cabeçalho fixo (64 bytes): formato de pixel em que o pacote foi gerado + nº de entradas."""
+    _fields_ = [
+        ("magic",     ctypes.c_char * 8),
+        ("version",   ctypes.c_uint32),
+        ("bitsize",   ctypes.c_uint32),
+        ("masks",     ctypes.c_uint32 * 4),   # R, G, B, A de convert_alpha() na tela
+        ("count",     ctypes.c_uint32),
+        ("_reserved", ctypes.c_uint8 * 28),
+    ]
+
+class BundleEntry(ctypes.LittleEndianStructure):
+    """Uma imagem: nome "arquivo@LxA", origem (para detectar PNG alterado) e onde estão os pixels."""
+    _fields_ = [
+        ("name",       ctypes.c_char * 64),
+        ("src_mtime",  ctypes.c_double),
+        ("src_size",   ctypes.c_uint64),
+        ("width",      ctypes.c_uint32),
+        ("height",     ctypes.c_uint32),
+        ("pitch",      ctypes.c_uint32),
+        ("_pad",       ctypes.c_uint32),
+        ("offset",     ctypes.c_uint64),   # a partir do início do arquivo, alinhado em 64
+        ("nbytes",     ctypes.c_uint64),
+    ]
+
+HEADER_SIZE = ctypes.sizeof(BundleHeader)
+ENTRY_SIZE = ctypes.sizeof(BundleEntry)
+_ALIGN = 64
+# folga no fim do arquivo: leitores que passam um pouco do fim de um buffer não
+# podem cair fora do mapa (o arquivo termina numa página inteira, com sobra)
+_PAGE = mmap.PAGESIZE
+
+# formato de convert_alpha() -> formato de pygame.image.frombuffer
+_BUFFER_FORMATS = {
+    (0x00FF0000, 0x0000FF00, 0x000000FF, 0xFF000000): "BGRA",
+    (0x000000FF, 0x0000FF00, 0x00FF0000, 0xFF000000): "RGBA",
+}
+
+def entry_name(filename, size=None):
+    return filename if size is None else f"{filename}@{size[0]}x{size[1]}"
+
+def _display_format():
+    """(bitsize, masks) que convert_alpha() produz na tela atual."""
+    probe = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+    return probe.get_bitsize(), tuple(probe.get_masks())
+
+def load_png(filename, size=None):
+    """O caminho por arquivo: PNG decodificado, convert_alpha e smoothscale."""
+    surf = pygame.image.load(os.path.join(IMAGES_DIR, filename)).convert_alpha()
+    if size is not None:
+        surf = pygame.transform.smoothscale(surf, size)
+    return surf
+
+class AssetBundle:
+    """
+    Leitura de um pacote gerado por bake(). O arquivo é mapeado como cópia privada
+    (nada é lido até ser usado e nada volta ao disco) e image() copia os pixels de
+    cada entrada para uma Surface própria: nenhuma Surface aponta para o mapa, e o
+    pacote pode ser fechado (ou coletado) logo depois da carga.
+    """
+    def __init__(self, path=BUNDLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        header = BundleHeader.from_buffer_copy(self._mm, 0)
+        if header.magic != MAGIC or header.version != VERSION:
+            raise ValueError(f"{path}: não é um pacote de assets v{VERSION}")
+        bitsize, masks = _display_format()
+        if (header.bitsize, tuple(header.masks)) != (bitsize, masks) or masks not in _BUFFER_FORMATS:
+            raise ValueError(f"{path}: gerado para outro formato de pixel; rode asset_bundle.py de novo")
+        self._format = _BUFFER_FORMATS[masks]
+        self.entries = {}
+        for i in range(header.count):
+            e = BundleEntry.from_buffer_copy(self._mm, HEADER_SIZE + i * ENTRY_SIZE)
+            if e.offset + e.nbytes > len(self._mm):
+                raise ValueError(f"{path}: pacote truncado")
+            self.entries[e.name.decode("utf-8")] = e
+
+    def image(self, filename, size=None):
+        """Surface da imagem, ou None se ela não está no pacote ou o PNG mudou depois do bake."""
+        e = self.entries.get(entry_name(filename, size))
+        if e is None:
+            return None
+        try:
+            st = os.stat(os.path.join(IMAGES_DIR, filename))
+            if (st.st_mtime, st.st_size) != (e.src_mtime, e.src_size):
+                return None
+        except OSError:
+            pass  # painel sem os PNGs: o pacote é a única fonte
+        if e.pitch != e.width * 4:
+            return None  # frombytes não aceita pitch com sobra no fim da linha
+        # bytes() copia exatamente a entrada; a Surface não segura nada do mapa
+        pixels = bytes(memoryview(self._mm)[e.offset:e.offset + e.nbytes])
+        return pygame.image.frombytes(pixels, (e.width, e.height), self._format)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+def open_bundle(path=BUNDLE_PATH):
+    """AssetBundle de `path`, ou None (sem pacote ou pacote que não serve para esta tela)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return AssetBundle(path)
+    except (OSError, ValueError) as e:
+        print(f"[assets] Ignorando pacote: {e}")
+        return None
+
+def bake(specs, path=BUNDLE_PATH):
+    """
+    Grava em `path` as imagens de `specs` [(arquivo, (L, A) ou None), ...] já
+    escaladas e convertidas para o formato da tela atual (precisa de display ativo).
+    """
+    bitsize, masks = _display_format()
+    specs = list(dict.fromkeys((f, tuple(s) if s is not None else None) for f, s in specs))
+    header = BundleHeader(magic=MAGIC, version=VERSION, bitsize=bitsize, count=len(specs))
+    header.masks[:] = masks
+    entries = []
+    blobs = []
+    offset = HEADER_SIZE + len(specs) * ENTRY_SIZE
+    for filename, size in specs:
+        surf = load_png(filename, size)
+        blob = surf.get_view("2").raw
+        offset = -(-offset // _ALIGN) * _ALIGN
+        st = os.stat(os.path.join(IMAGES_DIR, filename))
+        entries.append(BundleEntry(
+            name=entry_name(filename, size).encode("utf-8"),
+            src_mtime=st.st_mtime, src_size=st.st_size,
+            width=surf.get_width(), height=surf.get_height(), pitch=surf.get_pitch(),
+            offset=offset, nbytes=len(blob)))
+        blobs.append((offset, blob))
+        offset += len(blob)
+    # cada entrada termina alinhada e o arquivo acaba numa página inteira, com sobra
+    end = -(-(offset + _ALIGN) // _PAGE) * _PAGE
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(bytes(header))
+        for e in entries:
+            f.write(bytes(e))
+        for off, blob in blobs:
+            f.seek(off)
+            f.write(blob)
+        f.truncate(end)
+    os.replace(tmp, path)  # nunca deixa um pacote pela metade no lugar do bom
+    return entries
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Gera o pacote de imagens pré-escaladas para o boot rápido")
+    parser.add_argument("--out", default=BUNDLE_PATH)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import renderer
+    import rendererv2
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    specs = list(renderer.IMAGE_SPECS.values()) + list(rendererv2.IMAGE_SPECS.values())
+    entries = bake(specs, args.out)
+    total = os.path.getsize(args.out)
+    print(f"[assets] {len(entries)} imagens -> {args.out} ({total / 1024:.0f} KiB)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
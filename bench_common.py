@@ -0,0 +1,36 @@
+# bench_common.py
+# O que os benchmarks (bench_render / bench_startup / bench_simulator) têm em comum:
+# --out / --compare na linha de comando, o resultado anterior para comparação, o
+# JSON de saída e a variação percentual no relatório. Cada bench só mede e formata
+# as próprias linhas:
+#   def main(argv=None):
+#       bench_common.main(run, _print_report, _parse_args(argv))
+import json
+
+def parse_args(parser, argv=None):
+    """Acrescenta --out / --compare ao `parser` do bench e lê a linha de comando."""
+    parser.add_argument("--out", metavar="JSON", help="grava o resultado neste arquivo")
+    parser.add_argument("--compare", metavar="JSON", help="mostra a variação contra um resultado anterior")
+    return parser.parse_args(argv)
+
+def delta(new, old):
+    """"  (+3.2%)" de `old` para `new`; vazio sem valor anterior (None ou 0)."""
+    return f"  ({(new - old) / old * 100:+.1f}%)" if old else ""
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def save(res, path):
+    with open(path, "w") as f:
+        json.dump(res, f, indent=2, sort_keys=True)
+
+def main(run, report, args):
+    """res = run(args); report(res, anterior ou None); grava em --out. Devolve res."""
+    # o --compare é lido antes de medir: um caminho errado não desperdiça a rodada
+    prev = load(args.compare) if args.compare else None
+    res = run(args)
+    report(res, prev)
+    if args.out:
+        save(res, args.out)
+    return res
@@ -0,0 +1,130 @@
+# bench_render.py
+# Benchmark sem janela do draw_all (driver de vídeo "dummy" + Surface fora da tela):
+#   python bench_render.py renderer   --frames 1000 --out v1.json
+#   python bench_render.py rendererv2 --replay volta.tlm --out v2.json --compare v2_antes.json
+# Mede o tempo por frame e por widget (p50/p95/p99), alocações por frame e o FPS
+# alcançado sem limitador. O JSON de saída serve para comparar commits.
+import argparse
+import array
+import importlib
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+import bench_common
+from bench_common import delta
+from data_provider import DataProvider, ReplayProvider
+from profiling import WidgetProfiler
+
+SCREEN_SIZE = (1024, 600)
+
+def _percentiles(samples_ns):
+    ms = [s / 1e6 for s in samples_ns]
+    if len(ms) < 2:
+        v = ms[0] if ms else 0.0
+        return {"p50": v, "p95": v, "p99": v, "mean": v, "max": v}
+    q = statistics.quantiles(ms, n=100, method="inclusive")
+    return {"p50": q[49], "p95": q[94], "p99": q[98],
+            "mean": statistics.fmean(ms), "max": max(ms)}
+
+def _make_source(args):
+    if args.replay:
+        return ReplayProvider(args.replay, rate=0, loop=True)
+    random.seed(args.seed)
+    return DataProvider()
+
+def run(args):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    r = importlib.import_module(args.renderer)
+    r.load_assets()
+    surface = pygame.Surface(SCREEN_SIZE)
+    data = _make_source(args)
+
+    # aquecimento: monta as camadas estáticas e enche os caches (fora da medição)
+    for _ in range(args.warmup):
+        data.update()
+        r.draw_all(surface, data)
+
+    profiler = WidgetProfiler(r, window=args.frames)
+    profiler.enable()
+    try:
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            data.update()
+            r.draw_all(surface, data)
+        wall = time.perf_counter() - start
+    finally:
+        profiler.disable()
+
+    # alocações numa passada separada (tracemalloc distorce os tempos)
+    alloc_peak = array.array("q", bytes(8 * args.alloc_frames))  # pré-alocado: não entra na conta
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    for i in range(args.alloc_frames):
+        data.update()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        r.draw_all(surface, data)
+        alloc_peak[i] = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    blocks_after = sys.getallocatedblocks()
+    pygame.quit()
+
+    return {
+        "renderer": args.renderer,
+        "source": args.replay or f"DataProvider(seed={args.seed})",
+        "frames": args.frames,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "fps": args.frames / wall if wall else 0.0,
+        "frame_ms": _percentiles(profiler.frame_history),
+        "widgets_ms": {n: _percentiles(v) for n, v in profiler.history.items()},
+        "alloc": {
+            # pico de memória Python alocada dentro de um draw_all (superfícies SDL não entram)
+            "peak_bytes_per_frame_p50": statistics.median(alloc_peak) if alloc_peak else 0,
+            "peak_bytes_per_frame_max": max(alloc_peak) if alloc_peak else 0,
+            # blocos que sobraram vivos por frame (deveria ser ~0: vazamento/caches crescendo)
+            "net_blocks_per_frame": (blocks_after - blocks_before) / max(1, args.alloc_frames),
+        },
+    }
+
+def _print_report(res, prev=None):
+    f = res["frame_ms"]
+    print(f"[bench_render] {res['renderer']} — {res['frames']} frames, {res['source']}")
+    print(f"  frame  p50 {f['p50']:7.3f} ms  p95 {f['p95']:7.3f}  p99 {f['p99']:7.3f}"
+          + delta(f["p50"], prev and prev["frame_ms"]["p50"]))
+    print(f"  fps    {res['fps']:7.1f}" + delta(res["fps"], prev and prev["fps"]))
+    rows = sorted(res["widgets_ms"].items(), key=lambda kv: -kv[1]["p50"])
+    for name, w in rows:
+        old = prev and prev["widgets_ms"].get(name)
+        print(f"  {name:24s} p50 {w['p50']:7.3f} ms  p95 {w['p95']:7.3f}  p99 {w['p99']:7.3f}"
+              + delta(w["p50"], old and old["p50"]))
+    a = res["alloc"]
+    print(f"  alloc  pico {a['peak_bytes_per_frame_p50'] / 1024:.1f} KiB/frame (máx "
+          f"{a['peak_bytes_per_frame_max'] / 1024:.1f}), {a['net_blocks_per_frame']:+.2f} blocos/frame")
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sem janela do draw_all")
+    parser.add_argument("renderer", nargs="?", default="renderer", choices=("renderer", "rendererv2"))
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--alloc-frames", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--replay", metavar="ARQUIVO", help="usa um log gravado (--record) em vez do simulador")
+    return bench_common.parse_args(parser, argv)
+
+def main(argv=None):
+    bench_common.main(run, _print_report, _parse_args(argv))
+
+if __name__ == "__main__":
+    main()
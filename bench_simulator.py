@@ -0,0 +1,78 @@
+# bench_simulator.py
+# Vazão da simulação em carros·ticks/s: DataProvider.update() carro a carro
+# x BatchSimulator.step() com N carros num array do NumPy.
+#   python bench_simulator.py --cars 1,100,1000,10000 --out sim.json
+#   python bench_simulator.py --compare sim.json
+import argparse
+import platform
+import random
+import time
+
+import numpy as np
+
+import bench_common
+from bench_common import delta
+from data_provider import BatchSimulator, DataProvider
+
+def _rate(step, cars, seconds):
+    """carros·ticks/s chamando `step` (um tick de `cars` carros) por ~`seconds` segundos."""
+    step()  # aquecimento
+    ticks = 0
+    start = time.perf_counter()
+    while True:
+        step()
+        ticks += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return cars * ticks / elapsed, elapsed / ticks
+
+def _scalar(cars, seconds):
+    providers = [DataProvider() for _ in range(cars)]
+    def step():
+        for p in providers:
+            p.update()
+    return _rate(step, cars, seconds)
+
+def run(args):
+    random.seed(args.seed)
+    scalar_rate, _ = _scalar(args.scalar_cars, args.seconds)
+    batch = {}
+    for cars in args.cars:
+        sim = BatchSimulator(cars, seed=args.seed)
+        rate, per_step = _rate(sim.step, cars, args.seconds)
+        batch[str(cars)] = {"car_ticks_per_s": rate, "step_us": per_step * 1e6}
+    return {
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "scalar_car_ticks_per_s": scalar_rate,
+        "batch": batch,
+    }
+
+def _print_report(res, prev=None):
+    scalar = res["scalar_car_ticks_per_s"]
+    print(f"[bench_simulator] DataProvider.update(): {scalar:12,.0f} carros·ticks/s"
+          + delta(scalar, prev and prev["scalar_car_ticks_per_s"]))
+    for cars, r in res["batch"].items():
+        line = (f"  BatchSimulator {int(cars):7d} carros: {r['car_ticks_per_s']:12,.0f} carros·ticks/s"
+                f"  step {r['step_us']:9.1f} us  ({r['car_ticks_per_s'] / scalar:6.1f}x)")
+        if prev and cars in prev["batch"]:
+            line += delta(r["car_ticks_per_s"], prev["batch"][cars]["car_ticks_per_s"])
+        print(line)
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Vazão da simulação de telemetria (carros·ticks/s)")
+    parser.add_argument("--cars", type=lambda s: [int(v) for v in s.split(",")], default=[1, 100, 1000, 10000],
+                        help="tamanhos de lote, separados por vírgula")
+    parser.add_argument("--scalar-cars", type=int, default=100,
+                        help="quantos DataProviders na referência escalar")
+    parser.add_argument("--seconds", type=float, default=1.0, help="tempo de medição por caso")
+    parser.add_argument("--seed", type=int, default=1)
+    return bench_common.parse_args(parser, argv)
+
+def main(argv=None):
+    bench_common.main(run, _print_report, _parse_args(argv))
+
+if __name__ == "__main__":
+    main()
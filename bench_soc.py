@@ -0,0 +1,54 @@
+# bench_soc.py
+# Micro-benchmark da barra de SOC: gradiente refeito a cada frame (como era)
+# x gradiente em cache (gradients.hgradient). Roda sem janela:
+#   python bench_soc.py [frames]
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+import gradients
+import renderer
+
+def _legacy_soc_fill(surface, bar, soc, stops, radius):
+    """Preenchimento da barra como era feito antes: uma linha por coluna + máscara, todo frame."""
+    grad = pygame.Surface(bar.size, pygame.SRCALPHA)
+    for x in range(bar.width):
+        color = gradients._color_at(stops, x / max(1, bar.width - 1))
+        pygame.draw.line(grad, color, (x, 0), (x, bar.height - 1))
+    mask = pygame.Surface(bar.size, pygame.SRCALPHA)
+    pygame.draw.rect(mask, (255,255,255,255), mask.get_rect(), border_radius=radius)
+    grad.blit(mask, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
+    fill_w = int(bar.width * soc)
+    if fill_w > 0:
+        surface.blit(grad.subsurface((0, 0, fill_w, bar.height)), bar.topleft)
+
+def _cached_soc_fill(surface, bar, soc, stops, radius):
+    grad = gradients.hgradient(bar.size, stops, radius)
+    fill_w = int(bar.width * soc)
+    if fill_w > 0:
+        surface.blit(grad, bar.topleft, area=(0, 0, fill_w, bar.height))
+
+def _bench(fn, frames):
+    surface = pygame.Surface((1024, 600))
+    bar = pygame.Rect(255, 536, 515, 42)
+    start = time.perf_counter()
+    for i in range(frames):
+        fn(surface, bar, (i % 100) / 100.0, renderer.SOC_COLOR_STOPS, 11)
+    return (time.perf_counter() - start) / frames * 1e6
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    gradients.clear_cache()
+    before = _bench(_legacy_soc_fill, frames)
+    after = _bench(_cached_soc_fill, frames)
+    print(f"[bench_soc] antes (por frame):  {before:8.1f} us")
+    print(f"[bench_soc] depois (por frame): {after:8.1f} us  ({before / max(after, 1e-9):.0f}x)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
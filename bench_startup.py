@@ -0,0 +1,86 @@
+# bench_startup.py
+# Tempo de boot do painel, cada rodada num processo novo (driver de vídeo "dummy"):
+#   python bench_startup.py renderer --runs 10 --out boot_v1.json
+#   python bench_startup.py rendererv2 --compare boot_v2_antes.json
+# Mede, do lançamento do processo, até o primeiro frame na tela (logo + velocidade)
+# e até todos os assets carregados (painel completo a partir do frame seguinte).
+import argparse
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import asset_bundle
+import bench_common
+from bench_common import delta
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_FIRST = re.compile(r"\[main\] primeiro frame em (\d+) ms")
+_READY = re.compile(r"\[main\] assets prontos em (\d+) ms")
+
+def _boot_once(script, timeout=30.0):
+    """(ms até o primeiro frame, ms até os assets prontos), contados do spawn do processo."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-u", script, "--frames", "300"], cwd=_BASE_DIR, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    first = ready = None
+    try:
+        for line in proc.stdout:
+            now = (time.perf_counter() - start) * 1000
+            if first is None and _FIRST.search(line):
+                first = now
+            elif _READY.search(line):
+                ready = now
+                break
+            if now > timeout * 1000:
+                break
+    finally:
+        proc.kill()
+        proc.wait()
+    if first is None or ready is None:
+        raise RuntimeError(f"{script}: o main não reportou o boot (saiu com {proc.returncode})")
+    return first, ready
+
+def _summary(ms):
+    return {"p50": statistics.median(ms), "min": min(ms), "max": max(ms)}
+
+def run(args):
+    script = os.path.join(_BASE_DIR, f"main {args.renderer}.py")
+    first, ready = [], []
+    for _ in range(args.runs):
+        f, r = _boot_once(script)
+        first.append(f)
+        ready.append(r)
+    return {
+        "renderer": args.renderer,
+        "runs": args.runs,
+        "bundle": os.path.exists(asset_bundle.BUNDLE_PATH),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "first_frame_ms": _summary(first),
+        "assets_ready_ms": _summary(ready),
+    }
+
+def _print_report(res, prev=None):
+    print(f"[bench_startup] {res['renderer']} — {res['runs']} boots, "
+          f"pacote de assets: {'sim' if res['bundle'] else 'não'}")
+    for key, label in (("first_frame_ms", "primeiro frame"), ("assets_ready_ms", "assets prontos")):
+        s = res[key]
+        print(f"  {label:15s} p50 {s['p50']:7.1f} ms  min {s['min']:7.1f}  max {s['max']:7.1f}"
+              + delta(s["p50"], prev and prev[key]["p50"]))
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de boot até o primeiro frame")
+    parser.add_argument("renderer", nargs="?", default="renderer", choices=("renderer", "rendererv2"))
+    parser.add_argument("--runs", type=int, default=5)
+    return bench_common.parse_args(parser, argv)
+
+def main(argv=None):
+    bench_common.main(run, _print_report, _parse_args(argv))
+
+if __name__ == "__main__":
+    main()
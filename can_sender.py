@@ -0,0 +1,75 @@
+# can_sender.py
+# Faz o papel do barramento do carro: frames CAN do simulador codificados com o mapa
+# de sinais, numa carga escolhida do barramento de 1 Mbit/s.
+#   python can_sender.py --out volta.log --seconds 60 --busload 0.8   # log do candump
+#   python can_sender.py --iface vcan0 --busload 1.0                  # SocketCAN, tempo real
+#   python main\ renderer.py --can volta.log
+import argparse
+import time
+
+from can_telemetry import DEFAULT_SIGNALS, encode_signals, frame_values, open_socketcan, pack_can_frame
+from data_provider import DataProvider, FixedStepProvider
+
+BITRATE = 1_000_000
+# frame clássico de 8 bytes com ID de 11 bits: ~111 bits + bit stuffing no pior caso
+BITS_PER_FRAME = 135
+
+def generate(seconds, busload=1.0, signals=DEFAULT_SIGNALS, start=None):
+    """Gera (timestamp, can_id, data) espaçados para ocupar `busload` do barramento por `seconds`."""
+    # o simulador anda no tempo dos frames gerados, não no do laço
+    source = FixedStepProvider(DataProvider(), max_substeps=None)
+    fps = busload * BITRATE / BITS_PER_FRAME
+    ts = last = time.time() if start is None else start
+    end = ts + seconds
+    while ts < end:
+        source.update(ts - last)
+        last = ts
+        for can_id, data in encode_signals(signals, frame_values(source)).items():
+            yield ts, can_id, data
+            ts += 1.0 / fps
+
+def write_candump(path, frames, interface="can0"):
+    n = 0
+    with open(path, "w") as f:
+        for ts, can_id, data in frames:
+            f.write(f"({ts:.6f}) {interface} {can_id:03X}#{data.hex().upper()}\n")
+            n += 1
+    return n
+
+def send_socket(sock, frames, realtime=True):
+    """Escreve os frames como struct can_frame em `sock` (SocketCAN ou ponta de socketpair)."""
+    n = 0
+    t0 = ref = None
+    for ts, can_id, data in frames:
+        if realtime:
+            if t0 is None:
+                t0, ref = ts, time.perf_counter()
+            delay = ref + (ts - t0) - time.perf_counter()
+            if delay > 0.001:
+                time.sleep(delay)
+        sock.send(pack_can_frame(can_id, data))
+        n += 1
+    return n
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera tráfego CAN de telemetria (substitui o carro em testes)")
+    parser.add_argument("--out", metavar="ARQUIVO", help="grava um log no formato do candump -l")
+    parser.add_argument("--iface", help="envia para uma interface SocketCAN (ex.: vcan0), em tempo real")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--busload", type=float, default=1.0, help="fração do barramento de 1 Mbit/s")
+    args = parser.parse_args()
+    if not args.out and not args.iface:
+        parser.error("use --out e/ou --iface")
+    if args.out:
+        n = write_candump(args.out, generate(args.seconds, args.busload))
+        print(f"[can_sender] {n} frames ({n / args.seconds:.0f}/s) -> {args.out}")
+    if args.iface:
+        sock = open_socketcan(args.iface)
+        try:
+            n = send_socket(sock, generate(args.seconds, args.busload))
+        finally:
+            sock.close()
+        print(f"[can_sender] {n} frames -> {args.iface}")
+
+if __name__ == "__main__":
+    main()
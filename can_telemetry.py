@@ -0,0 +1,373 @@
+# can_telemetry.py
+import ctypes
+import re
+import select
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from telemetry_frame import TelemetryFrame, TYRES, FAULT_BIT
+
+# ---------- Mapa de sinais (estilo DBC) ----------
+# start/length em bits como no DBC: little-endian ("Intel", @1) conta do LSB do
+# byte 0; big-endian ("Motorola", @0) aponta o MSB do sinal na numeração do DBC.
+# O nome do sinal diz onde ele vai no TelemetryFrame: um campo ("rpm"), um pneu
+# ("tyre_temp_FL", "tyre_pressure_RR") ou uma falha ("fault_bms").
+Signal = namedtuple("Signal", "name can_id start length scale offset little_endian signed")
+
+def signal(name, can_id, start, length, scale=1.0, offset=0.0, little_endian=True, signed=False):
+    return Signal(name, can_id, start, length, scale, offset, little_endian, signed)
+
+# mapa de exemplo (IDs da bancada); o do carro vem do DBC do VCU via load_dbc()
+DEFAULT_SIGNALS = [
+    signal("rpm",            0x100,  0, 16),
+    signal("speed",          0x100, 16, 16, 0.1),
+    signal("accelerator",    0x100, 32,  8),
+    signal("brake",          0x100, 40,  8),
+    signal("soc",            0x101,  0, 16, 0.0001),
+    signal("power_delta",    0x101, 16, 16, 0.01, signed=True),
+    signal("battery_temp",   0x200,  0, 16, 0.1, signed=True),
+    signal("fault_bms",      0x200, 16,  1),
+    signal("fault_battery",  0x200, 17,  1),
+    signal("engine_temp",    0x201,  7, 16, 0.1, little_endian=False, signed=True),
+    signal("fault_inverter", 0x201, 16,  1),
+    signal("fault_engine",   0x201, 17,  1),
+] + [
+    signal(f"tyre_temp_{code}", 0x300, 16 * i, 16, 0.1) for i, code in enumerate(TYRES)
+] + [
+    signal(f"tyre_pressure_{code}", 0x301, 16 * i, 16, 0.01) for i, code in enumerate(TYRES)
+]
+
+_BO = re.compile(r"^BO_\s+(\d+)\s+")
+_SG = re.compile(r"^\s*SG_\s+(\w+)\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*\(([^,]+),([^)]+)\)")
+
+def load_dbc(path):
+    """Sinais de um arquivo DBC (só as linhas BO_ / SG_; o resto é ignorado)."""
+    signals = []
+    can_id = None
+    with open(path, encoding="latin-1") as f:
+        for line in f:
+            m = _BO.match(line)
+            if m:
+                can_id = int(m.group(1)) & 0x1FFFFFFF
+                continue
+            m = _SG.match(line)
+            if m and can_id is not None:
+                name, start, length, order, sign, scale, offset = m.groups()
+                signals.append(Signal(name, can_id, int(start), int(length), float(scale), float(offset),
+                                      order == "1", sign == "-"))
+    return signals
+
+# ---------- Decodificadores pré-compilados por ID ----------
+_INT_FIELDS = {name for name, ctype in TelemetryFrame._fields_
+               if isinstance(ctype, type) and issubclass(ctype, ctypes._SimpleCData) and ctype._type_ in "bBhHiIlLqQ"}
+_FIELDS = {name for name, _ in TelemetryFrame._fields_}
+
+def _setter(name):
+    """Função (frame, valor) que grava o sinal `name` no TelemetryFrame, ou None se não há destino."""
+    if name.startswith("fault_") and name[6:] in FAULT_BIT:
+        bit = FAULT_BIT[name[6:]]
+        def set_fault(frame, v):
+            frame.fault_bits = frame.fault_bits | bit if v else frame.fault_bits & ~bit
+        return set_fault
+    for prefix, array in (("tyre_temp_", "tyre_temps"), ("tyre_pressure_", "tyre_pressures")):
+        if name.startswith(prefix) and name[len(prefix):] in TYRES:
+            i = TYRES.index(name[len(prefix):])
+            def set_item(frame, v):
+                getattr(frame, array)[i] = v
+            return set_item
+    if name in _INT_FIELDS:
+        return lambda frame, v: setattr(frame, name, int(round(v)))
+    if name in _FIELDS and not name.startswith("_"):
+        return lambda frame, v: setattr(frame, name, v)
+    return None
+
+def compile_decoders(signals):
+    """
+    {can_id: decode(frame, data)}. Cada decodificador lê o payload uma vez como
+    inteiro e extrai os sinais do ID com deslocamento + máscara pré-calculados.
+    Sinais sem destino no frame são ignorados; num frame mais curto (DLC) que os
+    bytes do sinal ele fica com o valor anterior em vez de virar zero.
+    """
+    by_id = {}
+    for s in signals:
+        apply = _setter(s.name)
+        if apply is None:
+            continue
+        mask = (1 << s.length) - 1
+        if s.little_endian:
+            shift = s.start
+            nbytes = (s.start + s.length - 1) // 8 + 1
+        else:
+            # MSB do sinal no inteiro big-endian de 8 bytes; o sinal desce a partir dele
+            shift = (7 - s.start // 8) * 8 + s.start % 8 - s.length + 1
+            nbytes = 8 - shift // 8
+        sign = 1 << (s.length - 1) if s.signed else 0
+        by_id.setdefault(s.can_id, []).append((nbytes, s.little_endian, shift, mask, sign, s.scale, s.offset, apply))
+
+    def make(ops):
+        need_le = any(op[1] for op in ops)
+        need_be = not all(op[1] for op in ops)
+        def decode(frame, data):
+            size = len(data)
+            le = int.from_bytes(data, "little") if need_le else 0
+            be = int.from_bytes(data, "big") << (8 * (8 - size)) if need_be else 0
+            for nbytes, little, shift, mask, sign, scale, offset, apply in ops:
+                if nbytes > size:
+                    continue
+                raw = ((le if little else be) >> shift) & mask
+                if raw & sign:
+                    raw -= sign << 1
+                apply(frame, raw * scale + offset)
+        return decode
+    return {can_id: make(ops) for can_id, ops in by_id.items()}
+
+def encode_signals(signals, values):
+    """{can_id: bytes(8)} com `values` {nome: valor físico} (inverso do decode; para testes e o can_sender)."""
+    payloads = {}
+    for s in signals:
+        if s.name not in values:
+            continue
+        raw = int(round((values[s.name] - s.offset) / s.scale)) & ((1 << s.length) - 1)
+        if s.little_endian:
+            word = int.from_bytes(payloads.get(s.can_id, bytes(8)), "little")
+            word |= raw << s.start
+            payloads[s.can_id] = word.to_bytes(8, "little")
+        else:
+            shift = (7 - s.start // 8) * 8 + s.start % 8 - s.length + 1
+            word = int.from_bytes(payloads.get(s.can_id, bytes(8)), "big")
+            word |= raw << shift
+            payloads[s.can_id] = word.to_bytes(8, "big")
+    return payloads
+
+def frame_values(frame):
+    """{nome do sinal: valor} de um TelemetryFrame, nos nomes usados por DEFAULT_SIGNALS."""
+    values = {name: getattr(frame, name) for name in
+              ("rpm", "speed", "accelerator", "brake", "soc", "power_delta", "battery_temp", "engine_temp")}
+    for i, code in enumerate(TYRES):
+        values[f"tyre_temp_{code}"] = frame.tyre_temps[i]
+        values[f"tyre_pressure_{code}"] = frame.tyre_pressures[i]
+    for name in FAULT_BIT:
+        values[f"fault_{name}"] = int(frame.fault(name))
+    return values
+
+# ---------- Fontes de frames ----------
+# Uma fonte tem read_batch(max_frames, timeout) -> [(timestamp, can_id, data), ...]
+# ([] se nada chegou no timeout, None quando acabou) e close().
+
+_CANDUMP = re.compile(r"^\((\d+\.\d+)\)\s+\S+\s+([0-9A-Fa-f]{1,8})#([0-9A-Fa-f]*)\s*$")
+
+class CandumpSource:
+    """
+    Log no formato do `candump -l` ("(1700000000.123456) can0 100#0102..."). Com
+    `rate` = 1.0 os frames saem no ritmo gravado (N = N vezes mais rápido); com 0
+    saem o mais rápido possível, em lotes. Linhas que não são frames CAN clássicos
+    (remote, CAN FD) são puladas.
+    """
+    def __init__(self, path, rate=1.0, loop=False, clock=time.perf_counter):
+        self.path = path
+        self.rate = rate
+        self.loop = loop
+        self.skipped = 0
+        self._clock = clock
+        self._file = open(path)
+        self._pending = None
+        self._ref = None
+
+    def _next(self):
+        while True:
+            line = self._file.readline()
+            if not line:
+                if not self.loop:
+                    return None
+                self._file.seek(0)
+                self._ref = None
+                line = self._file.readline()
+                if not line:
+                    return None
+            m = _CANDUMP.match(line)
+            if m is None:
+                self.skipped += 1
+                continue
+            return float(m.group(1)), int(m.group(2), 16), bytes.fromhex(m.group(3))
+
+    def read_batch(self, max_frames=256, timeout=0.01):
+        batch = []
+        deadline = self._clock() + timeout
+        while len(batch) < max_frames:
+            frame = self._pending or self._next()
+            self._pending = None
+            if frame is None:
+                return batch or None
+            if self.rate:
+                if self._ref is None:
+                    self._ref = (frame[0], self._clock())
+                due = self._ref[1] + (frame[0] - self._ref[0]) / self.rate
+                now = self._clock()
+                if due > now:
+                    # junta tudo que vence até o fim da janela: lotes de ~timeout de barramento
+                    self._pending = frame
+                    if now >= deadline:
+                        break
+                    time.sleep(min(due, deadline) - now)
+                    continue
+            batch.append(frame)
+        return batch
+
+    def close(self):
+        self._file.close()
+
+# struct can_frame do SocketCAN: id (com flags), dlc, 3 bytes de padding, 8 de dados
+CAN_FRAME = struct.Struct("=IB3x8s")
+CAN_EFF_FLAG = 0x80000000
+CAN_RTR_FLAG = 0x40000000
+CAN_ERR_FLAG = 0x20000000
+
+def pack_can_frame(can_id, data):
+    return CAN_FRAME.pack(can_id | (CAN_EFF_FLAG if can_id > 0x7FF else 0), len(data), data.ljust(8, b"\0"))
+
+class SocketSource:
+    """
+    Frames `struct can_frame` (16 bytes) lidos de um socket: um socket SocketCAN
+    (open_socketcan("can0")) no carro, ou a ponta de um socket.socketpair() em que
+    um teste escreve pack_can_frame(...). Frames de erro/remote são descartados.
+    """
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self._buf = b""
+
+    def read_batch(self, max_frames=256, timeout=0.01):
+        size = CAN_FRAME.size
+        if len(self._buf) < size and not select.select([self.sock], [], [], timeout)[0]:
+            return []
+        try:
+            while len(self._buf) < max_frames * size:
+                chunk = self.sock.recv(max_frames * size - len(self._buf))
+                if not chunk:
+                    if len(self._buf) < size:
+                        return None  # o outro lado fechou
+                    break
+                self._buf += chunk
+        except BlockingIOError:
+            pass
+        n = len(self._buf) // size
+        now = time.time()
+        batch = []
+        for raw_id, dlc, data in CAN_FRAME.iter_unpack(self._buf[:n * size]):
+            if raw_id & (CAN_ERR_FLAG | CAN_RTR_FLAG):
+                continue
+            batch.append((now, raw_id & 0x1FFFFFFF, data[:dlc]))
+        self._buf = self._buf[n * size:]
+        return batch
+
+    def close(self):
+        self.sock.close()
+
+def open_socketcan(interface):
+    """Socket CAN_RAW ligado a `interface` (só Linux)."""
+    sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+    sock.bind((interface,))
+    return sock
+
+def open_source(spec, rate=1.0):
+    """"socketcan:can0" -> SocketSource; qualquer outra coisa é um log do candump."""
+    if spec.startswith("socketcan:"):
+        return SocketSource(open_socketcan(spec.split(":", 1)[1]))
+    return CandumpSource(spec, rate=rate, loop=True)
+
+# ---------- Provider ----------
+class CanTelemetryProvider(TelemetryFrame):
+    """
+    Telemetria do barramento CAN, com a mesma interface do DataProvider (update() /
+    snapshot() / campos do frame). Uma thread lê lotes de até `batch_size` frames
+    da `source`, decodifica todos num frame de trabalho (o último valor de cada
+    sinal vale) e publica uma cópia por lote trocando uma referência; update() só
+    copia a mais nova para si. Campos sem sinal no mapa ficam zerados.
+
+    Lotes pequenos mantêm curto o tempo em que a thread segura o GIL, então uma
+    rajada com o barramento cheio não trava o render. stats() traz a vazão.
+    """
+    def __init__(self, source, signals=DEFAULT_SIGNALS, batch_size=256):
+        super().__init__()
+        self.source = source
+        self.batch_size = batch_size
+        self.decoders = compile_decoders(signals)
+        self.frames = 0         # frames CAN decodificados
+        self.unknown = 0        # frames de IDs fora do mapa
+        self.batches = 0
+        self.decode_seconds = 0.0
+        self._work = TelemetryFrame()
+        self._latest = None
+        self._shown = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def decode_batch(self, batch):
+        """Decodifica `batch` [(timestamp, can_id, data), ...] no frame de trabalho; devolve quantos foram usados."""
+        decoders = self.decoders
+        work = self._work
+        used = 0
+        for ts, can_id, data in batch:
+            decode = decoders.get(can_id)
+            if decode is not None:
+                decode(work, data)
+                used += 1
+        if batch:
+            work.timestamp = batch[-1][0]
+        self.unknown += len(batch) - used
+        self.frames += used
+        return used
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self.source.read_batch(self.batch_size)
+            if batch is None:
+                break
+            if not batch:
+                continue
+            t0 = time.perf_counter()
+            if self.decode_batch(batch):
+                self._work.seq += 1
+                self._latest = self._work.copy()  # troca de referência: atômica para quem lê
+            self.decode_seconds += time.perf_counter() - t0
+            self.batches += 1
+
+    def start(self):
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="telemetry-can", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.source.close()
+
+    close = stop
+
+    def update(self):
+        frame = self._latest
+        if frame is not None and frame is not self._shown:
+            ctypes.memmove(ctypes.addressof(self), ctypes.addressof(frame), ctypes.sizeof(TelemetryFrame))
+            self._shown = frame
+
+    def snapshot(self):
+        return self.copy()
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "frames": self.frames,
+            "unknown": self.unknown,
+            "batches": self.batches,
+            "frames_per_s": self.frames / elapsed if elapsed else 0.0,
+            # vazão só do decode (quanto a thread aguentaria com o barramento sempre cheio)
+            "decode_frames_per_s": self.frames / self.decode_seconds if self.decode_seconds else 0.0,
+        }
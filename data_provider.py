@@ -1,8 +1,30 @@
 # data_provider.py
+import bisect
+import ctypes
 import random
+import threading
+import time
+from telemetry_frame import TelemetryFrame, TYRES, FAULT_BIT, parse_lap_time
+from telemetry_log import TelemetryLog
+
+try:
+    import numpy as np
+except ImportError:  # sem NumPy não há BatchSimulator; o resto do módulo não depende dele
+    np = None
+
+class DataProvider(TelemetryFrame):
+    """
+    Simulador de telemetria. O estado vive no próprio TelemetryFrame (layout fixo),
+    então o renderer lê os campos direto e snapshot() é só uma cópia do buffer.
+
+    Cada update() é um passo fixo de 1/SIM_HZ s de simulação (as constantes da
+    dinâmica foram ajustadas para esse passo). Para avançar por tempo, independente
+    de quantas vezes update() é chamado, use um FixedStepProvider por cima.
+    """
+    SIM_HZ = 30
 
-class DataProvider:
     def __init__(self):
+        super().__init__()
         self.rpm = 1000
         self.speed = 100
         self.soc = 0.95
@@ -11,17 +33,20 @@ class DataProvider:
         self.engine_temp = 20.0
         self.accelerator = 80
         self.brake = 10
-        self.tyre_data = {
-            'FL': {'temp': 50.0, 'pressure': 10}, 'FR': {'temp': 50.0, 'pressure': 10},
-            'RL': {'temp': 50.0, 'pressure': 10}, 'RR': {'temp': 50.0, 'pressure': 10}
-        }
-        self.lap_data = { "best": "1:25:123", "previous": "1:25:123", "current": "1:25:123" }
-        self.faults = {"bms": False, "inverter": False, "battery": False, "engine": False}
+        for i in range(len(TYRES)):
+            self.tyre_temps[i] = 50.0
+            self.tyre_pressures[i] = 10
+        for i, text in enumerate(("1:25:123", "1:25:123", "1:25:123")):  # best, previous, current
+            self.lap_ms[i] = parse_lap_time(text)
+        self.fault_bits = 0
         self.mode = "Endurance Mode"
         self._rpm_direction = 1
         self.battery_capacity_kwh = 85.0
 
     def update(self):
+        self.seq += 1
+        self.timestamp = time.time()
+
         # Simulação de RPM e Velocidade
         if self._rpm_direction == 1:
             self.rpm += random.randint(150, 250)
@@ -43,18 +68,353 @@ class DataProvider:
 
         # Atualização do SOC
         soc_delta = self.power_delta / self.battery_capacity_kwh
-        self.soc += (soc_delta / 500)
-        self.soc = max(0.0, min(1.0, self.soc))
+        self.soc = max(0.0, min(1.0, self.soc + (soc_delta / 500)))
 
         # Atualização das Temperaturas
         self.battery_temp = 20 + (1 - self.soc) * 40 + (self.speed / 180) * 20
         self.engine_temp = 20 + (self.rpm / 12000) * 90
         
         # Simulação dos Pneus
-        for key in self.tyre_data:
-            self.tyre_data[key]['temp'] += random.uniform(-0.1, 0.2)
-            self.tyre_data[key]['temp'] = max(40, min(100, self.tyre_data[key]['temp']))
+        temps = self.tyre_temps
+        for i in range(len(TYRES)):
+            temps[i] = max(40, min(100, temps[i] + random.uniform(-0.1, 0.2)))
 
         # Simulação de Falhas (mais provável de acontecer)
-        if random.random() < 0.005: self.faults["bms"] = not self.faults["bms"]
-        if random.random() < 0.005: self.faults["inverter"] = not self.faults["inverter"]
\ No newline at end of file
+        if random.random() < 0.005: self.set_fault("bms", not self.fault("bms"))
+        if random.random() < 0.005: self.set_fault("inverter", not self.fault("inverter"))
+
+    def snapshot(self):
+        """Cópia independente do estado atual (nada nela é alterado por update() depois)."""
+        return self.copy()
+
+
+# campos contínuos, interpolados entre os dois últimos passos; o resto vem do passo mais novo
+_LERP_FIELDS = ("timestamp", "soc", "power_delta", "battery_temp", "engine_temp")
+_LERP_INT_FIELDS = ("rpm", "speed", "accelerator", "brake")
+_LERP_ARRAYS = ("tyre_temps", "tyre_pressures")
+# folga na comparação do acumulado com o passo: somas de dt em float (ex.: 144 x 1/144)
+# chegam a um passo menos alguns 1e-15 s e perderiam o passo
+_STEP_EPS = 1e-9
+
+class FixedStepProvider(TelemetryFrame):
+    """
+    Simulação por tempo, desacoplada do FPS: update(dt) acumula `dt` segundos
+    (vezes `rate`) e roda `sim.update()`, um passo fixo de 1/sim.SIM_HZ s, quantas
+    vezes couberem no acumulado. Assim o carro anda igual a 15, 30 ou 144 FPS e,
+    com `rate` > 1 ou dt grande, mais rápido que o tempo real. Sem `dt`, update()
+    mede o tempo pelo `clock`. O `timestamp` de cada passo é o tempo simulado.
+
+    `max_substeps` limita os passos por update() (um travamento longo não vira uma
+    rajada de passos; o atraso é descartado e contado em `dropped`); None = sem
+    limite. Com `interpolate`, os campos contínuos mostram o ponto entre os dois
+    últimos passos (fração do acumulado que sobrou), ao custo de um passo de atraso.
+    """
+    def __init__(self, sim, rate=1.0, max_substeps=8, interpolate=True, clock=time.perf_counter):
+        super().__init__()
+        self.sim = sim
+        self.rate = rate  # ("speed" já é campo do frame)
+        self.max_substeps = max_substeps
+        self.interpolate = interpolate
+        self.step_dt = 1.0 / sim.SIM_HZ
+        self.steps = 0
+        self.dropped = 0.0  # segundos de simulação descartados por max_substeps
+        self.accumulator = 0.0
+        # relógio simulado: o timestamp de cada passo anda step_dt, em qualquer `rate`
+        self.sim_time = time.time()
+        self._clock = clock
+        self._last = None
+        self._prev = sim.snapshot()
+        self._show(0.0)
+
+    def _show(self, alpha):
+        sim = self.sim
+        ctypes.memmove(ctypes.addressof(self), ctypes.addressof(sim), ctypes.sizeof(TelemetryFrame))
+        if not self.interpolate or alpha <= 0.0:
+            return
+        prev = self._prev
+        for name in _LERP_FIELDS:
+            a = getattr(prev, name)
+            setattr(self, name, a + (getattr(sim, name) - a) * alpha)
+        for name in _LERP_INT_FIELDS:
+            a = getattr(prev, name)
+            setattr(self, name, int(round(a + (getattr(sim, name) - a) * alpha)))
+        for name in _LERP_ARRAYS:
+            a, b, out = getattr(prev, name), getattr(sim, name), getattr(self, name)
+            for i in range(len(out)):
+                out[i] = a[i] + (b[i] - a[i]) * alpha
+
+    def update(self, dt=None):
+        if dt is None:
+            now = self._clock()
+            dt = 0.0 if self._last is None else now - self._last
+            self._last = now
+        # dt negativo (relógio que voltou, chamador errado) deixaria o acumulado
+        # negativo e o carro parado até compensar: conta como tempo nenhum
+        dt = max(0.0, dt)
+        self.accumulator += dt * self.rate
+        n = 0
+        while self.accumulator >= self.step_dt - _STEP_EPS:
+            if self.max_substeps is not None and n >= self.max_substeps:
+                # atrasado demais: segue do estado atual em vez de tentar alcançar
+                self.dropped += self.accumulator - self.accumulator % self.step_dt
+                self.accumulator %= self.step_dt
+                break
+            if self.interpolate:
+                ctypes.memmove(ctypes.addressof(self._prev), ctypes.addressof(self.sim),
+                               ctypes.sizeof(TelemetryFrame))
+            self.sim.update()
+            self.sim_time += self.step_dt
+            self.sim.timestamp = self.sim_time
+            self.accumulator -= self.step_dt
+            n += 1
+        self.steps += n
+        # com interpolate, mesmo sem passo novo a fração andou: o frame é refeito sempre
+        if n or self.interpolate:
+            self._show(self.accumulator / self.step_dt)
+
+    def snapshot(self):
+        return self.copy()
+
+
+class CarView(TelemetryFrame):
+    """
+    Um carro do BatchSimulator com a interface do DataProvider: os campos são o
+    próprio registro dele em BatchSimulator.frames (sem cópia). update() avança o
+    lote inteiro quando esta visão já viu o tick atual; com várias visões lidas
+    em sequência, a primeira avança e as outras só acompanham.
+    """
+    def update(self):
+        sim = self._sim
+        if self._tick == sim.ticks:
+            sim.step()
+        self._tick = sim.ticks
+        sim.sync()
+
+    def snapshot(self):
+        self._sim.sync()
+        return self.copy()
+
+
+class BatchSimulator:
+    """
+    N carros simulados de uma vez, para teste de carga (gravador, barramento,
+    painéis de box). O estado de cada grandeza é um array do NumPy com um valor
+    por carro (rpm, direção, soc, temperaturas, pneus, falhas...), e step() aplica
+    a todos, com operações vetorizadas, a mesma dinâmica do DataProvider.update().
+
+    Para consumo, `frames` é um array estruturado com o layout do TelemetryFrame
+    (um registro por carro), reescrito a partir do estado por sync(), só quando
+    alguém lê e no máximo uma vez por tick: rodar step() sem ler não paga a cópia.
+    car(i) devolve uma CarView sobre o registro do carro i.
+
+    Os sorteios vêm de um numpy.random.Generator com `seed`, em ordem fixa por
+    step(): passo do RPM, freio, pneus, falhas.
+    """
+    # grandezas que step() altera (copiadas para `frames` em sync())
+    STATE = ("rpm", "speed", "accelerator", "brake", "soc", "power_delta",
+             "battery_temp", "engine_temp", "tyre_temps", "fault_bits")
+
+    def __init__(self, cars, seed=None, battery_capacity_kwh=85.0):
+        if np is None:
+            raise ImportError("BatchSimulator precisa do NumPy")
+        self.rng = np.random.default_rng(seed)
+        self.battery_capacity_kwh = battery_capacity_kwh
+        self.ticks = 0
+        self.timestamp = 0.0
+        # estado inicial igual ao de um DataProvider novo
+        template = DataProvider()
+        self.frames = np.frombuffer(bytes(template) * cars, dtype=np.dtype(TelemetryFrame)).copy()
+        self.state = {name: self.frames[name].copy() for name in self.STATE}
+        self.direction = np.ones(cars, dtype=np.int8)
+        self._synced = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def car(self, i):
+        view = CarView.from_buffer(self.frames, int(i) * self.frames.itemsize)
+        view._sim = self
+        view._tick = self.ticks
+        view.index = i
+        return view
+
+    def sync(self):
+        """Passa o estado do tick atual para `frames` (nada a fazer se já passou)."""
+        if self._synced == self.ticks:
+            return
+        f = self.frames
+        for name, values in self.state.items():
+            f[name] = values
+        f["seq"] += self.ticks - self._synced
+        f["timestamp"] = self.timestamp
+        self._synced = self.ticks
+
+    def step(self):
+        st = self.state
+        n = len(self.direction)
+        rng = self.rng
+        self.ticks += 1
+        self.timestamp = time.time()
+
+        # RPM: sobe 150..250 ou desce 300..400 (os dois com 101 valores: um sorteio só)
+        rising = self.direction == 1
+        step = rng.integers(0, 101, n, dtype=np.int32)
+        rpm = st["rpm"]
+        rpm += np.where(rising, 150 + step, -(300 + step))
+        self.direction[rising & (rpm > 11800)] = -1
+        self.direction[~rising & (rpm < 1000)] = 1
+        rpm_frac = rpm / 12000
+        speed = st["speed"]
+        speed[:] = rpm_frac * 180
+
+        # pedais e delta de potência
+        accelerating = (self.direction == 1) & (rpm > 1500)
+        brake = rng.uniform(0.2, 0.8, n)
+        st["accelerator"][:] = np.where(accelerating, rpm_frac * 100, 0)
+        st["brake"][:] = np.where(accelerating, 0, brake * 100)
+        power_delta = st["power_delta"]
+        power_delta[:] = np.where(accelerating, -(10 + rpm_frac * 50), 5 + (speed / 180) * 15)
+
+        # SOC e temperaturas
+        soc = st["soc"]
+        soc += (power_delta / self.battery_capacity_kwh) / 500
+        np.clip(soc, 0.0, 1.0, out=soc)
+        st["battery_temp"][:] = 20 + (1 - soc) * 40 + (speed / 180) * 20
+        st["engine_temp"][:] = 20 + rpm_frac * 90
+        tyres = st["tyre_temps"]
+        tyres += rng.uniform(-0.1, 0.2, (n, len(TYRES)))
+        np.clip(tyres, 40, 100, out=tyres)
+
+        # falhas: bms e inverter trocam de estado com chance de 0,5% cada
+        flips = rng.random((n, 2)) < 0.005
+        st["fault_bits"] ^= (flips[:, 0] * FAULT_BIT["bms"] | flips[:, 1] * FAULT_BIT["inverter"]).astype(np.uint32)
+
+
+class ReplayProvider(TelemetryFrame):
+    """
+    Fonte de dados que reproduz um log do TelemetryRecorder, com a mesma interface
+    do DataProvider (update() / snapshot() / campos do frame). Os frames são lidos
+    do disco sob demanda por um gerador.
+
+    `rate` = 1.0 toca em tempo real, N toca N vezes mais rápido e 0/None avança
+    exatamente um frame gravado por update() (o mais rápido possível, determinístico).
+    seek() usa um índice esparso de timestamps (um a cada `index_every` frames).
+    """
+    def __init__(self, path, rate=1.0, loop=False, index_every=256, clock=time.perf_counter):
+        super().__init__()
+        self.log = TelemetryLog(path)
+        if not len(self.log):
+            raise ValueError(f"{path}: log sem frames")
+        self.rate = rate  # ("speed" já é campo do frame)
+        self.loop = loop
+        self.finished = False
+        self._clock = clock
+        self._index_ts = []
+        self._index_pos = []
+        for i in range(0, len(self.log), index_every):
+            self._index_ts.append(self.log[i].timestamp)
+            self._index_pos.append(i)
+        self.start_time = self._index_ts[0]
+        self.end_time = self.log[-1].timestamp
+        self.seek(self.start_time)
+
+    def _frames(self, start):
+        for i in range(start, len(self.log)):
+            yield self.log[i]
+
+    def _show(self, frame):
+        ctypes.memmove(ctypes.addressof(self), ctypes.addressof(frame), ctypes.sizeof(TelemetryFrame))
+
+    def seek(self, timestamp):
+        """Posiciona no último frame com timestamp <= `timestamp` (ou no primeiro)."""
+        k = max(0, bisect.bisect_right(self._index_ts, timestamp) - 1)
+        frames = self._frames(self._index_pos[k])
+        current = next(frames)
+        pending = next(frames, None)
+        while pending is not None and pending.timestamp <= timestamp:
+            current, pending = pending, next(frames, None)
+        self._show(current)
+        self._frames_iter = frames
+        self._pending = pending
+        self.finished = False
+        # referência do relógio de reprodução
+        self._ref_ts = current.timestamp
+        self._ref_clock = self._clock()
+
+    def update(self):
+        if self._pending is None:
+            if not self.loop:
+                self.finished = True
+                return
+            self.seek(self.start_time)
+            return
+        if not self.rate:
+            current = self._pending
+            self._pending = next(self._frames_iter, None)
+        else:
+            target = self._ref_ts + (self._clock() - self._ref_clock) * self.rate
+            if self._pending.timestamp > target:
+                return
+            # pula direto para o último frame já vencido; só ele é copiado
+            current = self._pending
+            self._pending = next(self._frames_iter, None)
+            while self._pending is not None and self._pending.timestamp <= target:
+                current = self._pending
+                self._pending = next(self._frames_iter, None)
+        self._show(current)
+
+    def snapshot(self):
+        return self.copy()
+
+    def close(self):
+        self.log.close()
+
+
+class ThreadedProvider:
+    """
+    Roda `provider.update()` numa thread própria a `rate_hz`, independente do FPS
+    do render. Cada amostra vira um snapshot novo, publicado trocando uma única
+    referência (atômica no CPython): quem lê com latest() nunca bloqueia e nunca
+    vê um snapshot pela metade. Com `recorder` (um TelemetryRecorder), cada amostra
+    também é gravada, ainda nesta thread.
+    """
+    def __init__(self, provider, rate_hz=200.0, recorder=None):
+        self.provider = provider
+        self.rate_hz = rate_hz
+        self.recorder = recorder
+        self.samples = 0
+        self._latest = provider.snapshot()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self):
+        return self._latest
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        next_t = time.perf_counter()
+        while not self._stop.is_set():
+            self.provider.update()
+            if self.recorder is not None:
+                self.recorder.write(self.provider)
+            self._latest = self.provider.snapshot()
+            self.samples += 1
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # atrasou (ex.: GIL ocupado): segue a partir de agora, sem rajada de updates
+                next_t = time.perf_counter()
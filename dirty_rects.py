@@ -0,0 +1,50 @@
+# dirty_rects.py
+import pygame
+
+class DirtyTracker:
+    """
+    Registra, por widget, os valores exibidos no último frame e acumula o
+    retângulo do widget só quando esses valores mudam. O Layout redesenha só
+    esses retângulos e o loop principal os passa para pygame.display.update().
+    """
+    def __init__(self):
+        self._last = {}
+        self._rects = []
+        self._full = None
+
+    def invalidate(self, rect):
+        """Esquece os valores anteriores e força atualização de `rect` inteiro no próximo pop()."""
+        self._last.clear()
+        self._full = pygame.Rect(rect)
+
+    def add(self, rect):
+        """Força `rect` no próximo pop(), sem comparar valores (ex.: algo desenhado por cima da tela)."""
+        self._rects.append(pygame.Rect(rect))
+
+    def mark(self, key, rect, *values):
+        """
+        Marca `rect` (ou uma lista de retângulos) como sujo se os valores de `key`
+        mudaram desde o último frame; devolve True nesse caso.
+        """
+        if self._last.get(key) == values:
+            return False
+        self._last[key] = values
+        for r in (rect if isinstance(rect, list) else [rect]):
+            self._rects.append(pygame.Rect(r))
+        return True
+
+    def pop(self):
+        """Devolve os retângulos sujos do frame (sobrepostos já unidos) e zera a lista."""
+        if self._full is not None:
+            rects = [self._full]
+            self._full = None
+        else:
+            rects = []
+            for r in self._rects:
+                i = r.collidelist(rects)
+                while i != -1:
+                    r = r.union(rects.pop(i))
+                    i = r.collidelist(rects)
+                rects.append(r)
+        self._rects = []
+        return rects
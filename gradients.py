@@ -0,0 +1,145 @@
+# gradients.py
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # sem NumPy: o gradiente é gerado coluna a coluna (só uma vez por chave)
+    np = None
+
+_CACHE = {}
+_RAMPS = {}
+
+def _column_colors(stops, w):
+    """Cor de cada posição 0..w-1 ao longo do gradiente, mesma aritmética de _color_at (lerp + int)."""
+    t = np.arange(w, dtype=np.float64) / max(1, w - 1)
+    t = np.clip(t, 0.0, 1.0)
+    out = np.empty((w, 3), dtype=np.float64)
+    out[:] = stops[-1][1]
+    # percorre do último ao primeiro trecho: em t == p1 vale o primeiro trecho, como no laço original
+    for (p0, c0), (p1, c1) in reversed(list(zip(stops[:-1], stops[1:]))):
+        sel = (p0 <= t) & (t <= p1)
+        u = (t[sel] - p0) / (p1 - p0) if p1 > p0 else np.zeros(sel.sum())
+        for ch in range(3):
+            out[sel, ch] = c0[ch] + (c1[ch] - c0[ch]) * u
+    return out.astype(np.int64).astype(np.uint8)
+
+def _color_at(stops, t):
+    t = max(0.0, min(1.0, t))
+    for (p0, c0), (p1, c1) in zip(stops[:-1], stops[1:]):
+        if p0 <= t <= p1:
+            u = (t - p0) / (p1 - p0) if p1 > p0 else 0
+            return tuple(int(a + (b - a) * u) for a, b in zip(c0, c1))
+    return tuple(stops[-1][1])
+
+class ColorRamp:
+    """
+    Gradiente por `stops` [(pos, cor), ...] pré-calculado em `size` cores: a cor i
+    é a da posição i / (size - 1). `ramp[i]` devolve a tupla RGB, `ramp.at(t)` a
+    entrada mais próxima de t em [0, 1] e `ramp.array` é a tabela (size, 3) uint8
+    para preencher superfícies via surfarray (None sem NumPy).
+
+    Com `size` igual ao número de pixels/segmentos a preencher, cada índice cai
+    exatamente na posição que o desenho usaria. Use ramp() para compartilhar.
+    """
+    def __init__(self, stops, size=256):
+        self.stops = tuple((p, tuple(c)) for p, c in stops)
+        self.size = size
+        if np is not None:
+            self.array = _column_colors(self.stops, size)
+            self.colors = tuple(map(tuple, self.array.tolist()))
+        else:
+            self.array = None
+            self.colors = tuple(_color_at(self.stops, i / max(1, size - 1)) for i in range(size))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        return self.colors[i]
+
+    def __iter__(self):
+        return iter(self.colors)
+
+    def at(self, t):
+        return self.colors[int(max(0.0, min(1.0, t)) * (self.size - 1) + 0.5)]
+
+def ramp(stops, size=256):
+    """ColorRamp de (stops, size), criado uma vez e reutilizado."""
+    stops = tuple((p, tuple(c)) for p, c in stops)
+    key = (stops, size)
+    r = _RAMPS.get(key)
+    if r is None:
+        r = _RAMPS[key] = ColorRamp(stops, size)
+    return r
+
+def hgradient(size, stops, radius, inset_y=0):
+    """
+    Superfície SRCALPHA com gradiente horizontal por `stops` [(pos, cor), ...],
+    recortada em retângulo de cantos `radius`. `inset_y` linhas ficam transparentes
+    em cima e embaixo. Gerada uma vez por (size, stops, radius, inset_y) e reutilizada;
+    para preencher só uma fração, blite com area=(0, 0, largura, altura).
+    """
+    stops = tuple((p, tuple(c)) for p, c in stops)
+    key = ("h", tuple(size), stops, radius, inset_y)
+    surf = _CACHE.get(key)
+    if surf is not None:
+        return surf
+
+    w, h = size
+    surf = pygame.Surface((w, h), pygame.SRCALPHA)
+    if np is not None:
+        rows = slice(inset_y, h - inset_y)
+        px = pygame.surfarray.pixels3d(surf)
+        px[:, rows] = ramp(stops, w).array[:, None, :]
+        del px
+        alpha = pygame.surfarray.pixels_alpha(surf)
+        alpha[:, rows] = 255
+        del alpha
+    else:
+        for x, color in enumerate(ramp(stops, w)):
+            pygame.draw.line(surf, color, (x, inset_y), (x, h - 1 - inset_y))
+
+    # máscara de cantos arredondados
+    mask = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, w, h), border_radius=radius)
+    surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+    _CACHE[key] = surf
+    return surf
+
+def vgradient(size, stops, radius=0):
+    """
+    Como hgradient, mas vertical: a base da superfície é a posição 0 dos `stops` e
+    o topo é a 1. Para um preenchimento de baixo para cima até a altura `fill_h`,
+    blite com area=(0, altura - fill_h, largura, fill_h).
+    """
+    stops = tuple((p, tuple(c)) for p, c in stops)
+    key = ("v", tuple(size), stops, radius)
+    surf = _CACHE.get(key)
+    if surf is not None:
+        return surf
+
+    w, h = size
+    surf = pygame.Surface((w, h), pygame.SRCALPHA)
+    if np is not None:
+        px = pygame.surfarray.pixels3d(surf)
+        px[:] = ramp(stops, h).array[None, ::-1, :]
+        del px
+        alpha = pygame.surfarray.pixels_alpha(surf)
+        alpha[:] = 255
+        del alpha
+    else:
+        for i, color in enumerate(ramp(stops, h)):
+            pygame.draw.line(surf, color, (0, h - 1 - i), (w - 1, h - 1 - i))
+
+    if radius:
+        mask = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, w, h), border_radius=radius)
+        surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+    _CACHE[key] = surf
+    return surf
+
+def clear_cache():
+    _CACHE.clear()
+    _RAMPS.clear()
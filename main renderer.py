@@ -1,6 +1,13 @@
 # main.py
+import time
+_T0 = time.perf_counter()  # início do processo (para o tempo até o primeiro frame)
+
+import argparse
+import os
 import pygame
-from data_provider import DataProvider
+from data_provider import DataProvider, FixedStepProvider, ReplayProvider, ThreadedProvider
+from telemetry_log import TelemetryRecorder
+from profiling import WidgetProfiler, draw_overlay
 import renderer as renderer  # versão atualizada do renderer
 
 SCREEN_WIDTH = 1024
@@ -14,28 +21,91 @@ def _make_window(fullscreen: bool) -> pygame.Surface:
         flags |= pygame.FULLSCREEN
     # **Sem SCALED por padrão** (evita o bug em alguns setups no Win)
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+    # nova janela -> recompõe as camadas estáticas no formato dela
+    renderer.invalidate_layers()
     return screen
 
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Dashboard UTForce")
+    parser.add_argument("--telemetry-hz", type=float, default=0,
+                        help="amostra a telemetria numa thread própria nesta taxa "
+                             "(0 = update() no loop de render, um por frame)")
+    parser.add_argument("--record", metavar="ARQUIVO",
+                        help="grava cada amostra de telemetria neste arquivo (buffer circular)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="com --record: sobrescreve o arquivo se ele já existir")
+    parser.add_argument("--replay", metavar="ARQUIVO",
+                        help="reproduz um arquivo gravado com --record no lugar do simulador")
+    parser.add_argument("--replay-rate", type=float, default=1.0,
+                        help="velocidade do replay (1 = tempo real, 0 = um frame gravado por update)")
+    parser.add_argument("--sim-rate", type=float, default=1.0,
+                        help="velocidade do simulador (1 = tempo real, independente do FPS)")
+    parser.add_argument("--udp", metavar="[HOST:]PORTA",
+                        help="recebe a telemetria do VCU por UDP nesta porta (ex.: 5005 ou 0.0.0.0:5005)")
+    parser.add_argument("--can", metavar="FONTE",
+                        help="telemetria do barramento CAN: socketcan:can0 ou um log do candump -l")
+    parser.add_argument("--can-dbc", metavar="ARQUIVO", help="mapa de sinais (DBC) para --can")
+    # o mesmo nome que shm_telemetry.DEFAULT_NAME (literal: o módulo só é importado com --shm)
+    parser.add_argument("--shm", metavar="NOME", nargs="?", const="utforce_telemetry",
+                        help="lê a telemetria do barramento em memória compartilhada publicado "
+                             "pelo shm_telemetry.py (padrão: utforce_telemetry)")
+    parser.add_argument("--frames", type=int, default=0,
+                        help="sai depois de N frames (0 = roda até fechar); usado pelo bench_startup.py")
+    args = parser.parse_args()
+    # antes de abrir a janela: sem --overwrite uma gravação anterior não é apagada
+    if args.record and not args.overwrite and os.path.exists(args.record):
+        parser.error(f"{args.record} já existe (use --overwrite para sobrescrever)")
+    return args
+
 def main():
-    pygame.init()
+    args = _parse_args()
+    # só o que o painel usa: sem áudio/joystick/etc. no boot
+    pygame.display.init()
+    pygame.font.init()
     pygame.display.set_caption("Dashboard UTForce")
 
     # abre em JANELA
     fullscreen = False
     screen = _make_window(fullscreen)
 
-    # carrega assets
+    # primeira etapa dos assets: fontes + o necessário para o frame de boot
+    loading = renderer.load_assets_steps()
     try:
-        renderer.load_assets()
+        next(loading)
     except Exception as e:
         print("[main] ERRO em load_assets:", e)
+        loading = None
 
-    data = DataProvider()
+    if args.replay:
+        data = ReplayProvider(args.replay, rate=args.replay_rate, loop=True)
+    elif args.udp:
+        # só com --udp: o asyncio pesa no boot
+        from udp_telemetry import UdpTelemetryProvider
+        host, _, port = args.udp.rpartition(":")
+        data = UdpTelemetryProvider(host or "0.0.0.0", int(port)).start()
+        print(f"[main] telemetria UDP em {data.host}:{data.port}")
+    elif args.can:
+        from can_telemetry import CanTelemetryProvider, DEFAULT_SIGNALS, load_dbc, open_source
+        signals = load_dbc(args.can_dbc) if args.can_dbc else DEFAULT_SIGNALS
+        data = CanTelemetryProvider(open_source(args.can), signals).start()
+    elif args.shm:
+        from shm_telemetry import SharedTelemetryProvider
+        data = SharedTelemetryProvider(args.shm)
+        print(f"[main] telemetria do barramento {args.shm} (produtor pid {data.stats()['producer_pid']})")
+    else:
+        # simulador por tempo: o carro anda igual com o FPS que for
+        data = FixedStepProvider(DataProvider(), rate=args.sim_rate)
+    recorder = TelemetryRecorder(args.record, overwrite=args.overwrite) if args.record else None
+    telemetry = None
+    if args.telemetry_hz > 0:
+        telemetry = ThreadedProvider(data, rate_hz=args.telemetry_hz, recorder=recorder).start()
+    profiler = WidgetProfiler(renderer)  # F3 liga/desliga; desligado não toca no renderer
     clock = pygame.time.Clock()
 
     print("[main] pygame display init:", pygame.display.get_init())
     print("[main] window size:", screen.get_size())
 
+    frames = 0
     running = True
     while running:
         # eventos
@@ -48,13 +118,60 @@ def main():
                 elif event.key == pygame.K_F11:
                     fullscreen = not fullscreen
                     screen = _make_window(fullscreen)
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+                    profiler.reset()
+                    # apaga/mostra o overlay: a tela inteira é reposta no próximo frame
+                    renderer.DIRTY.add(screen.get_rect())
 
         # update + draw
-        data.update()
-        renderer.draw_all(screen, data)
+        if telemetry is not None:
+            frame = telemetry.latest()  # último snapshot publicado, sem bloquear
+        else:
+            data.update()
+            if recorder is not None:
+                recorder.write(data)
+            frame = data
+        if loading is not None:
+            # boot: frame mínimo (logo + velocidade) enquanto o resto carrega
+            rects = renderer.LAYOUT.draw_boot(screen, frame)
+        else:
+            # envia à tela só as regiões cujos valores mudaram
+            rects = renderer.draw_all(screen, frame)
+        if profiler.enabled:
+            overlay = draw_overlay(screen, profiler, clock.get_fps())
+            rects.append(overlay)
+            # o painel fica por cima do frame: a área volta a ser redesenhada no próximo
+            renderer.DIRTY.add(overlay)
+        pygame.display.update(rects)
+        frames += 1
+        if frames == 1:
+            print(f"[main] primeiro frame em {(time.perf_counter() - _T0) * 1000:.0f} ms")
+
+        if loading is not None:
+            # etapas de carga até gastar o tempo de um frame; o boot frame segue atualizado
+            budget_end = time.perf_counter() + 1.0 / FPS
+            try:
+                while time.perf_counter() < budget_end:
+                    next(loading)
+            except StopIteration:
+                loading = None
+                print(f"[main] assets prontos em {(time.perf_counter() - _T0) * 1000:.0f} ms")
+            except Exception as e:
+                print("[main] ERRO em load_assets:", e)
+                loading = None
 
+        if args.frames and frames >= args.frames:
+            running = False
         clock.tick(FPS)
 
+    if telemetry is not None:
+        telemetry.stop()
+    if args.udp or args.can or args.shm:
+        print("[main] telemetria:", data.stats())
+        data.stop()
+    if recorder is not None:
+        recorder.close()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+# profiling.py
+import time
+from collections import deque
+import pygame
+
+class WidgetProfiler:
+    """
+    Cronometra (perf_counter_ns) cada widget dinâmico do LAYOUT do renderer e o
+    draw_all inteiro, guardando os últimos `window` frames de cada um (0 ns nos
+    frames em que o widget não precisou ser redesenhado).
+
+    enable() troca o `draw` de cada Widget e o draw_all do módulo (o main o
+    procura no módulo a cada chamada) por versões cronometradas; disable()
+    devolve os originais. Desligado, o caminho de desenho é exatamente o de
+    sempre: custo zero, não só pequeno.
+    """
+    def __init__(self, renderer, window=180):
+        self.renderer = renderer
+        self.widgets = [w for w in renderer.LAYOUT.widgets if w.dynamic]
+        self.names = [w.name for w in self.widgets]
+        self.window = window
+        self.enabled = False
+        self.history = {n: deque(maxlen=window) for n in self.names}
+        self.frame_history = deque(maxlen=window)  # ns por draw_all
+        self._frame = {}
+        self._originals = {}
+
+    def _timed(self, name, fn):
+        frame = self._frame
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                frame[name] = frame.get(name, 0) + time.perf_counter_ns() - t0
+        timed.__wrapped__ = fn
+        return timed
+
+    def _timed_draw_all(self, fn):
+        frame = self._frame
+        history = self.history
+        def draw_all(surface, data):
+            frame.clear()
+            t0 = time.perf_counter_ns()
+            rects = fn(surface, data)
+            self.frame_history.append(time.perf_counter_ns() - t0)
+            for name, samples in history.items():
+                samples.append(frame.get(name, 0))
+            return rects
+        draw_all.__wrapped__ = fn
+        return draw_all
+
+    def enable(self):
+        if self.enabled:
+            return
+        for w in self.widgets:
+            self._originals[w] = w.draw
+            w.draw = self._timed(w.name, w.draw)
+        self._originals["draw_all"] = self.renderer.draw_all
+        self.renderer.draw_all = self._timed_draw_all(self.renderer.draw_all)
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.renderer.draw_all = self._originals.pop("draw_all")
+        for w, draw in self._originals.items():
+            w.draw = draw
+        self._originals.clear()
+        self.enabled = False
+
+    def toggle(self):
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    def reset(self):
+        self.frame_history.clear()
+        for samples in self.history.values():
+            samples.clear()
+
+    def slowest(self, n=3):
+        """[(nome, média em ms), ...] dos `n` widgets mais lentos na janela."""
+        means = [(name, sum(s) / len(s) / 1e6) for name, s in self.history.items() if s]
+        means.sort(key=lambda kv: -kv[1])
+        return means[:n]
+
+# ---------- Overlay ----------
+OVERLAY_RECT = pygame.Rect(8, 44, 230, 112)
+_OVERLAY = {}
+
+def draw_overlay(surface, profiler, fps, budget_ms=1000 / 30):
+    """Painel com FPS, sparkline do tempo de draw_all e os 3 widgets mais lentos; devolve o rect."""
+    if "font" not in _OVERLAY:
+        _OVERLAY["font"] = pygame.font.Font(None, 18)
+    font = _OVERLAY["font"]
+    rect = OVERLAY_RECT
+    panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 190))
+
+    frames = profiler.frame_history
+    last_ms = frames[-1] / 1e6 if frames else 0.0
+    panel.blit(font.render(f"FPS {fps:5.1f}   draw {last_ms:5.2f} ms", True, (255, 255, 255)), (6, 4))
+
+    # sparkline: escala fixa no orçamento do frame (ou no pico, se passar dele)
+    spark = pygame.Rect(6, 20, rect.width - 12, 36)
+    pygame.draw.rect(panel, (60, 60, 60), spark, 1)
+    if len(frames) > 1:
+        top = max(budget_ms, max(frames) / 1e6)
+        step = spark.width / (profiler.window - 1)
+        pts = [(spark.left + i * step, spark.bottom - 1 - (ns / 1e6) / top * (spark.height - 2))
+               for i, ns in enumerate(frames)]
+        pygame.draw.lines(panel, (65, 182, 44), False, pts)
+        y = spark.bottom - 1 - budget_ms / top * (spark.height - 2)
+        pygame.draw.line(panel, (255, 0, 4), (spark.left, y), (spark.right - 1, y))
+
+    y = spark.bottom + 4
+    for name, ms in profiler.slowest(3):
+        label = name.split(".", 1)[-1]
+        panel.blit(font.render(f"{label:<20s} {ms:6.3f} ms", True, (200, 200, 200)), (6, y))
+        y += 16
+    surface.blit(panel, rect)
+    return rect
@@ -0,0 +1,75 @@
+# render_assets.py
+# O que renderer.py e rendererv2.py têm em comum: camadas, carregamento de fontes e
+# imagens (do asset_bundle ou do PNG) em etapas. Cada renderer passa as próprias
+# tabelas (tamanhos de fonte, IMAGE_SPECS, BOOT_IMAGES) e os dicionários que enche.
+import os
+import pygame
+import asset_bundle
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_PATH = os.path.join(_BASE_DIR, "assets", "fonts", "Orbitron-Bold.ttf")
+
+# ---------- Camadas ----------
+# "background": estático desenhado sob os valores (caixas, rótulos, logo);
+# "dynamic": o que depende de `data` e muda a cada frame;
+# "foreground": estático desenhado por cima dos valores (divisórias, listras).
+# O padrão "all" desenha tudo na ordem original (uso avulso das funções).
+def in_layer(layer, name):
+    return layer == "all" or layer == name
+
+def clamp01(v):
+    return max(0.0, min(1.0, v))
+
+# ---------- Carregamento ----------
+def load_image(name, size=None, bundle=None):
+    """Do pacote pré-escalado (asset_bundle.py), se houver; senão do PNG."""
+    surf = bundle.image(name, size) if bundle is not None else None
+    if surf is None:
+        surf = asset_bundle.load_png(name, size)
+    return surf
+
+def _load_image_spec(images, image_specs, key, bundle):
+    filename, size = image_specs[key]
+    try:
+        images[key] = load_image(filename, size, bundle)
+    except Exception as e:
+        print(f"[renderer] Erro ao carregar {filename}: {e}.")
+
+def load_fonts(fonts, sizes, fallback_sizes=None):
+    """Orbitron em cada tamanho de `sizes`; sem ela, Arial negrito em `fallback_sizes` (ou `sizes`)."""
+    try:
+        pygame.font.init()
+        for key, size in sizes.items():
+            fonts[key] = pygame.font.Font(FONT_PATH, size)
+    except Exception as e:
+        print(f"[renderer] Erro ao carregar assets: {e}. Usando fallbacks.")
+        for key, size in (fallback_sizes or sizes).items():
+            fonts[key] = pygame.font.SysFont("Arial", size, bold=True)
+
+def load_assets_steps(fonts, font_sizes, images, image_specs, boot_images, text_caches,
+                      invalidate_layers, prewarm=None, fallback_sizes=None):
+    """
+    Carrega os assets em etapas (gerador). A primeira deixa prontas as fontes e as
+    imagens de `boot_images`, o bastante para LAYOUT.draw_boot(); cada etapa seguinte
+    carrega uma imagem. No fim roda `prewarm` (sprites que o renderer monta uma vez)
+    e invalida as camadas, que são recompostas no próximo draw_all.
+    """
+    load_fonts(fonts, font_sizes, fallback_sizes)
+    for cache in text_caches:
+        cache.clear()
+
+    bundle = asset_bundle.open_bundle()
+    for key in boot_images:
+        _load_image_spec(images, image_specs, key, bundle)
+    invalidate_layers()
+    yield
+
+    for key in image_specs:
+        if key not in boot_images:
+            _load_image_spec(images, image_specs, key, bundle)
+            yield
+    if bundle is not None:
+        bundle.close()  # as Surfaces têm cópia própria dos pixels
+    if prewarm is not None:
+        prewarm()
+    invalidate_layers()
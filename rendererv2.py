@@ -1,7 +1,12 @@
 # rendererv2.py
-import os
 import math
 import pygame
+from text_cache import TextCache, OutlinedTextCache
+from telemetry_frame import FAULTS
+from widgets import Layout, register
+from render_assets import clamp01, in_layer
+import gradients
+import render_assets
 
 # ---------- Cores ----------
 COLORS = {
@@ -27,16 +32,33 @@ COLORS = {
 }
 FONTS = {}
 IMAGES = {}
+TEXT = TextCache(FONTS)
+# RPM/velocidade mudam todo frame: montados por dígito para o cache não crescer
+OUTLINED = OutlinedTextCache(TEXT, digit_fonts=("rpm_num", "speed_num"))
+RING_SPRITES = {}
+
+# ---------- Assets ----------
+# fonte (Orbitron, ou Arial nos mesmos tamanhos se ela faltar) -> tamanho
+FONT_SIZES = {
+    "speed_num": 96, "soc_title": 64, "rpm_num": 64, "speed_unit": 36, "rpm_unit": 24,
+    "pedal_letters": 24, "lap_num": 20, "soc_num": 20, "tyre_loc": 16, "temp_value": 16,
+    "alert_text": 16, "lap_title": 14,
+    "speed_mode": 24,  # modo dentro do círculo
+    "tyre_info": 20, "temp_labels": 14,
+}
 
-# ---------- Paths ----------
-_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-def _apath(*parts): return os.path.join(_BASE_DIR, *parts)
-
-def _load_image(name, size=None):
-    surf = pygame.image.load(_apath("assets", "images", name)).convert_alpha()
-    if size is not None:
-        surf = pygame.transform.smoothscale(surf, size)
-    return surf
+# imagens do painel: chave em IMAGES -> (arquivo em assets/images, tamanho final ou None)
+IMAGE_SPECS = {
+    "battery_temp":  ("icon_battery_temp.png",  (24, 24)),
+    "engine_temp":   ("icon_engine_temp.png",   (24, 24)),
+    "bms":           ("icon_bms.png",           (36, 36)),
+    "inverter":      ("icon_inverter.png",      (36, 36)),
+    "battery_fault": ("icon_battery_fault.png", (36, 36)),
+    "engine_fault":  ("icon_engine_fault.png",  (36, 36)),
+    "logo_utforce":  ("logo_utforce.png",       (83, 83)),
+}
+# carregadas antes do primeiro frame (LAYOUT.draw_boot); o resto vem nos frames seguintes
+BOOT_IMAGES = ("logo_utforce",)
 
 # ---------- Gradiente stops ----------
 TEMP_COLOR_STOPS = [
@@ -47,94 +69,75 @@ TEMP_COLOR_STOPS = [
     (1.00, (0xFF, 0x00, 0x04)),
 ]
 def _lerp(a, b, t): return a + (b - a) * t
-def _lerp_color(c1, c2, t):
-    return (int(_lerp(c1[0], c2[0], t)),
-            int(_lerp(c1[1], c2[1], t)),
-            int(_lerp(c1[2], c2[2], t)))
-def _color_from_stops(stops, t):
-    t = max(0.0, min(1.0, t))
-    for i in range(len(stops) - 1):
-        p0, c0 = stops[i]; p1, c1 = stops[i + 1]
-        if p0 <= t <= p1:
-            u = (t - p0) / (p1 - p0) if p1 > p0 else 0
-            return _lerp_color(c0, c1, u)
-    return stops[-1][1]
+
+def _blit_over_opaque(surface, src, rect):
+    """Blita `src` em uma camada SRCALPHA apenas sobre pixels já opacos."""
+    clip = rect.clip(surface.get_rect())
+    if not clip.width or not clip.height:
+        return
+    area = surface.subsurface(clip)
+    keep = area.copy()
+    keep.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_MAX)  # RGB=255, alpha original
+    surface.blit(src, rect)
+    area.blit(keep, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
 
 # ---------- Carregamento ----------
+def load_assets_steps():
+    """
+    Carrega os assets em etapas (gerador; ver render_assets.load_assets_steps). O
+    main avança uma etapa por frame para mostrar o painel logo no boot;
+    load_assets() roda todas de uma vez.
+    """
+    # anel de RPM do círculo de velocidade (356x356 em 326,115)
+    yield from render_assets.load_assets_steps(
+        FONTS, FONT_SIZES, IMAGES, IMAGE_SPECS, BOOT_IMAGES, (TEXT, OUTLINED), invalidate_layers,
+        prewarm=lambda: _rpm_ring_sprite((504, 293), 178))
+
 def load_assets():
-    try:
-        pygame.font.init()
-        orbit = _apath("assets","fonts","Orbitron-Bold.ttf")
-        FONTS["speed_num"]     = pygame.font.Font(orbit, 96)
-        FONTS["soc_title"]     = pygame.font.Font(orbit, 64)
-        FONTS["rpm_num"]       = pygame.font.Font(orbit, 64)
-        FONTS["speed_unit"]    = pygame.font.Font(orbit, 36)
-        FONTS["rpm_unit"]      = pygame.font.Font(orbit, 24)
-        FONTS["pedal_letters"] = pygame.font.Font(orbit, 24)
-        FONTS["lap_num"]       = pygame.font.Font(orbit, 20)
-        FONTS["soc_num"]       = pygame.font.Font(orbit, 20)
-        FONTS["tyre_loc"]      = pygame.font.Font(orbit, 16)
-        FONTS["temp_value"]    = pygame.font.Font(orbit, 16)
-        FONTS["alert_text"]    = pygame.font.Font(orbit, 16)
-        FONTS["lap_title"]     = pygame.font.Font(orbit, 14)
-        FONTS["speed_mode"]    = pygame.font.Font(orbit, 24)  # modo dentro do círculo
-        FONTS["tyre_info"]     = pygame.font.Font(orbit, 20)
-        FONTS["temp_labels"]   = pygame.font.Font(orbit, 14)
-
-        # Imagens
-        IMAGES["battery_temp"]  = _load_image("icon_battery_temp.png", (24, 24))
-        IMAGES["engine_temp"]   = _load_image("icon_engine_temp.png",  (24, 24))
-        IMAGES["bms"]           = _load_image("icon_bms.png",            (36, 36))
-        IMAGES["inverter"]      = _load_image("icon_inverter.png",       (36, 36))
-        IMAGES["battery_fault"] = _load_image("icon_battery_fault.png",  (36, 36))
-        IMAGES["engine_fault"]  = _load_image("icon_engine_fault.png",   (36, 36))
-        # nome de arquivo conforme você informou: "logo_utforce.png"
-        IMAGES["logo_utforce"]  = _load_image("logo_utforce.png",        (83, 83))
-    except Exception as e:
-        print(f"[renderer] Erro ao carregar assets: {e}. Usando fallbacks.")
-        for k, size in {
-            "speed_num":96,"soc_title":64,"rpm_num":64,"speed_unit":36,"rpm_unit":24,
-            "pedal_letters":24,"lap_num":20,"soc_num":20,"tyre_loc":16,"temp_value":16,
-            "alert_text":16,"lap_title":14,"speed_mode":24,"tyre_info":20,"temp_labels":14
-        }.items():
-            FONTS[k] = pygame.font.SysFont("Arial", size, bold=True)
+    for _ in load_assets_steps():
+        pass
 
 # ---------- Utilidades ----------
-def draw_text_with_outline(font, text, fg_color, outline_color, surface, center, ow=2):
-    txt = font.render(text, True, fg_color)
-    out = font.render(text, True, outline_color)
-    rect = txt.get_rect(center=center)
-    for dx in (-ow,0,ow):
-        for dy in (-ow,0,ow):
-            if dx or dy:
-                surface.blit(out, rect.move(dx, dy))
-    surface.blit(txt, rect)
+def draw_text_with_outline(font_key, text, fg_color, outline_color, surface, center, ow=2):
+    # sprite já com as 8 cópias do contorno (composto uma vez, em cache)
+    OUTLINED.blit(surface, font_key, text, fg_color, outline_color, center, ow)
 
 # ---------- Anel RPM (gradiente 25% + preenchimento por rpm) ----------
-def _ring_color_by_fraction(f):
-    # 0-0.25 azul->teal, 0.25-0.5 teal->verde, 0.5-0.75 verde->amarelo, 0.75-1 amarelo->vermelho
-    stops = [
-        (0.00, COLORS["grad_0"]),
-        (0.25, COLORS["grad_25"]),
-        (0.50, COLORS["grad_50"]),
-        (0.75, COLORS["grad_75"]),
-        (1.00, COLORS["grad_100"]),
-    ]
-    return _color_from_stops(stops, f)
+# 0-0.25 azul->teal, 0.25-0.5 teal->verde, 0.5-0.75 verde->amarelo, 0.75-1 amarelo->vermelho
+RING_COLOR_STOPS = [
+    (0.00, COLORS["grad_0"]),
+    (0.25, COLORS["grad_25"]),
+    (0.50, COLORS["grad_50"]),
+    (0.75, COLORS["grad_75"]),
+    (1.00, COLORS["grad_100"]),
+]
+
+def _rpm_ring_sprite(center, radius, thickness=16, segments=64):
+    """
+    Anel pré-desenhado (uma vez por geometria) numa superfície de 8 bits em que cada
+    pixel guarda o índice do segmento + 1 (0 = transparente). As linhas são traçadas
+    na mesma ordem de antes, então cada pixel fica com o último segmento que o cobre.
+    Acender/apagar segmentos é só trocar a paleta; desenhar é um único blit.
+    """
+    key = (tuple(center), radius, thickness, segments)
+    sprite = RING_SPRITES.get(key)
+    if sprite is not None:
+        return sprite
 
-def draw_rpm_ring(surface, rpm_value, rpm_max, center, radius, thickness=16):
     inner = radius - thickness
-    segments = 64
-    ratio = max(0.0, min(1.0, rpm_value / float(rpm_max)))
-    lit = int(round(segments * ratio))
+    c = radius + 4  # folga para a espessura das linhas
+    # pontos calculados em coordenadas de tela e só depois deslocados (exato), para
+    # arredondar igual ao desenho direto na tela
+    ox, oy = center[0] - c, center[1] - c
+    surf = pygame.Surface((2*c + 1, 2*c + 1), 0, 8)
+    surf.fill(0)
+    surf.set_colorkey(0)
 
     phase_deg = 90.0  # 0% começa no BOTTOM (90° em tela pygame)
 
     for i in range(segments):
         a0 = i * (360.0 / segments) + phase_deg
         a1 = (i+1) * (360.0 / segments) + phase_deg
-        color = _ring_color_by_fraction(i / max(segments-1, 1))
-        seg_color = color if i < lit else (60, 60, 60)
 
         steps = 6
         for s in range(steps):
@@ -143,50 +146,80 @@ def draw_rpm_ring(surface, rpm_value, rpm_max, center, radius, thickness=16):
             y0 = center[1] + inner * math.sin(ang)
             x1 = center[0] + radius * math.cos(ang)
             y1 = center[1] + radius * math.sin(ang)
-            pygame.draw.line(surface, seg_color, (x0, y0), (x1, y1), 3)
+            pygame.draw.line(surf, i + 1, (x0 - ox, y0 - oy), (x1 - ox, y1 - oy), 3)
+
+    sprite = {
+        "surface": surf,
+        "topleft": (ox, oy),
+        "colors": list(gradients.ramp(RING_COLOR_STOPS, segments)),
+        "lit": None,
+    }
+    RING_SPRITES[key] = sprite
+    return sprite
+
+def draw_rpm_ring(surface, rpm_value, rpm_max, center, radius, thickness=16):
+    segments = 64
+    ratio = max(0.0, min(1.0, rpm_value / float(rpm_max)))
+    lit = int(round(segments * ratio))
+
+    sprite = _rpm_ring_sprite(center, radius, thickness, segments)
+    surf = sprite["surface"]
+    if sprite["lit"] != lit:
+        # índice 0 = fundo (colorkey); 1..lit = cor do segmento; resto = apagado
+        surf.set_palette([(0, 0, 0)] + sprite["colors"][:lit] + [(60, 60, 60)] * (segments - lit))
+        sprite["lit"] = lit
+    surface.blit(surf, sprite["topleft"])
 
 # ---------- Blocos ----------
-def draw_rpm_box(surface, rpm, pos=(353,3), size=(298,106)):
+def draw_rpm_box(surface, rpm, pos=(353,3), size=(298,106), layer="all"):
     rect = pygame.Rect(pos, size)
-    pygame.draw.rect(surface, (26,26,26), rect, border_radius=15)
-    pygame.draw.rect(surface, COLORS["border_red"], rect, width=2, border_radius=15)
-    draw_text_with_outline(FONTS["rpm_num"], f"{rpm}", COLORS["white"], COLORS["border_red"], surface, (rect.centerx-30, rect.centery-4))
-    draw_text_with_outline(FONTS["rpm_unit"], "RPM", COLORS["white"], COLORS["border_red"], surface, (rect.right-40, rect.centery+22))
-
-def draw_speed_circle(surface, data, pos=(326,115), size=(356,356)):
+    if in_layer(layer, "background"):
+        pygame.draw.rect(surface, (26,26,26), rect, border_radius=15)
+        pygame.draw.rect(surface, COLORS["border_red"], rect, width=2, border_radius=15)
+    if in_layer(layer, "dynamic"):
+        draw_text_with_outline("rpm_num", f"{rpm}", COLORS["white"], COLORS["border_red"], surface, (rect.centerx-30, rect.centery-4))
+    if in_layer(layer, "background"):
+        draw_text_with_outline("rpm_unit", "RPM", COLORS["white"], COLORS["border_red"], surface, (rect.right-40, rect.centery+22))
+
+def draw_speed_circle(surface, data, pos=(326,115), size=(356,356), layer="all"):
     cx, cy = pos[0]+size[0]//2, pos[1]+size[1]//2
     radius = size[0]//2
 
     # anel rpm
-    draw_rpm_ring(surface, data.rpm, 12000, (cx,cy), radius)
+    if in_layer(layer, "dynamic"):
+        draw_rpm_ring(surface, data.rpm, 12000, (cx,cy), radius)
 
-    # face interna
-    pygame.draw.circle(surface, COLORS["background"], (cx,cy), radius-20)
+    # face interna (o anel não invade o raio da face)
+    if in_layer(layer, "background"):
+        pygame.draw.circle(surface, COLORS["background"], (cx,cy), radius-20)
+    if not in_layer(layer, "dynamic"):
+        return
 
     # número e unidade com afastamento garantido
-    speed_rect = FONTS["speed_num"].render(str(data.speed), True, COLORS["white"]).get_rect()
-    unit_rect  = FONTS["speed_unit"].render("Km/h", True, COLORS["white"]).get_rect()
+    speed_rect = TEXT.render("speed_num", str(data.speed), COLORS["white"]).get_rect()
+    unit_rect  = TEXT.render("speed_unit", "Km/h", COLORS["white"]).get_rect()
 
     # posiciono primeiro o número, um pouquinho mais à esquerda
     num_center = (cx-24, cy-10)
-    draw_text_with_outline(FONTS["speed_num"], f"{data.speed}",
+    draw_text_with_outline("speed_num", f"{data.speed}",
                            COLORS["white"], COLORS["border_red"], surface, num_center)
 
     # agora posiciono a unidade à direita com folga mínima de 8 px
     unit_left = (num_center[0] + speed_rect.width//2) + 12
     unit_center = (max(unit_left + unit_rect.width//2, cx+92), cy+30)
-    draw_text_with_outline(FONTS["speed_unit"], "Km/h",
+    draw_text_with_outline("speed_unit", "Km/h",
                            COLORS["white"], COLORS["border_red"], surface, unit_center)
 
     # modo
-    draw_text_with_outline(FONTS["speed_mode"],  data.mode,
+    draw_text_with_outline("speed_mode",  data.mode,
                            COLORS["white"], COLORS["border_red"], surface, (cx, cy+80))
 
 
-def draw_laps(surface, data, pos=(28,74), size=(178,206)):
+def draw_laps(surface, data, pos=(28,74), size=(178,206), layer="all"):
     rect = pygame.Rect(pos, size)
-    pygame.draw.rect(surface, (26,26,26), rect, border_radius=50)
-    pygame.draw.rect(surface, COLORS["border_red"], rect, width=4, border_radius=50)
+    if in_layer(layer, "background"):
+        pygame.draw.rect(surface, (26,26,26), rect, border_radius=50)
+        pygame.draw.rect(surface, COLORS["border_red"], rect, width=4, border_radius=50)
 
     y = rect.y + 14
     line_gap_title = 24
@@ -197,13 +230,20 @@ def draw_laps(surface, data, pos=(28,74), size=(178,206)):
         ("previous", "Volta Anterior", "text_yellow"),
         ("current", "Volta Atual", "text_blue"),
     ]:
-        tit = FONTS["lap_title"].render(title, True, COLORS[color])
-        surface.blit(tit, (rect.x + 14, y)); y += line_gap_title
-        val = FONTS["lap_num"].render(data.lap_data[key], True, COLORS["white"])
-        surface.blit(val, (rect.x + 14, y)); y += line_gap_value
+        if in_layer(layer, "background"):
+            tit = TEXT.render("lap_title", title, COLORS[color])
+            surface.blit(tit, (rect.x + 14, y))
+        y += line_gap_title
+        if in_layer(layer, "dynamic"):
+            val = TEXT.render("lap_num", data.lap_time(key), COLORS["white"])
+            surface.blit(val, (rect.x + 14, y))
+        y += line_gap_value
 
 
-def draw_soc(surface, data, pos=(342,473), size=(320,110)):
+# stops do <linearGradient> do SVG: 0 -> #FF0000 ; 0.394231 -> #FFD900 ; 1 -> #41B62C
+SOC_COLOR_STOPS = [(0.0, (255,0,0)), (0.394231, (255,217,0)), (1.0, (0x41,0xB6,0x2C))]
+
+def draw_soc(surface, data, pos=(342,473), size=(320,110), layer="all"):
     """
     Desenha o bloco SOC (320x110) no estilo do SVG fornecido:
       - Título "SOC" com contorno vermelho
@@ -216,18 +256,20 @@ def draw_soc(surface, data, pos=(342,473), size=(320,110)):
 
     # ----------------- Cabeçalho -----------------
     # "SOC" com contorno vermelho (estética dos paths vermelhos do SVG)
-    draw_text_with_outline(
-        FONTS["soc_title"], "SOC",
-        COLORS["white"], COLORS["border_red"],
-        surface, (rect.left + 96, rect.top + 28)
-    )
+    if in_layer(layer, "background"):
+        draw_text_with_outline(
+            "soc_title", "SOC",
+            COLORS["white"], COLORS["border_red"],
+            surface, (rect.left + 96, rect.top + 28)
+        )
 
     # Delta kW à direita (verde para valores >=0; vermelho caso contrário)
-    sign  = "+" if data.power_delta >= 0 else ""
-    color = COLORS["pedal_green"] if data.power_delta >= 0 else COLORS["pedal_red"]
-    delta_txt = f"{sign}{data.power_delta:.1f}kW"
-    delta_surf = FONTS["soc_num"].render(delta_txt, True, color)
-    surface.blit(delta_surf, delta_surf.get_rect(midright=(rect.right - 10, rect.top + 30)))
+    if in_layer(layer, "dynamic"):
+        sign  = "+" if data.power_delta >= 0 else ""
+        color = COLORS["pedal_green"] if data.power_delta >= 0 else COLORS["pedal_red"]
+        delta_txt = f"{sign}{data.power_delta:.1f}kW"
+        delta_surf = TEXT.render("soc_num", delta_txt, color)
+        surface.blit(delta_surf, delta_surf.get_rect(midright=(rect.right - 10, rect.top + 30)))
 
     # ----------------- Barra inferior -----------------
     # No SVG: y≈77.75, h≈33.25, rx=11, stroke=#FF0004 (2px)
@@ -235,45 +277,26 @@ def draw_soc(surface, data, pos=(342,473), size=(320,110)):
     bar_rect = pygame.Rect(rect.left, rect.bottom - bar_h, rect.width, bar_h)
 
     # Fundo e borda (stroke) com cantos arredondados
-    pygame.draw.rect(surface, COLORS["background"], bar_rect, border_radius=11)
-    pygame.draw.rect(surface, COLORS["border_red"], bar_rect, width=2, border_radius=11)
+    if in_layer(layer, "background"):
+        pygame.draw.rect(surface, COLORS["background"], bar_rect, border_radius=11)
+        pygame.draw.rect(surface, COLORS["border_red"], bar_rect, width=2, border_radius=11)
 
-    # Gradiente horizontal (como no <linearGradient> do SVG)
-    # stops: 0 -> #FF0000 ; 0.394231 -> #FFD900 ; 1 -> #41B62C
+    # Gradiente horizontal (como no <linearGradient> do SVG), 1px transparente
+    # em cima/embaixo e máscara com o mesmo raio 11 — gerado uma vez, em cache
     grad_w = bar_rect.width - 2
     grad_h = bar_rect.height - 2
-    if grad_w > 0 and grad_h > 0:
-        grad_surf = pygame.Surface((grad_w, grad_h), pygame.SRCALPHA)
-        for x in range(grad_w):
-            t = x / max(1, grad_w - 1)
-            if t <= 0.394231:
-                u = t / 0.394231
-                c0, c1 = (255, 0, 0), (255, 217, 0)
-            else:
-                u = (t - 0.394231) / (1 - 0.394231)
-                c0, c1 = (255, 217, 0), (0x41, 0xB6, 0x2C)
-            col = (
-                int(c0[0]*(1-u)+c1[0]*u),
-                int(c0[1]*(1-u)+c1[1]*u),
-                int(c0[2]*(1-u)+c1[2]*u),
-            )
-            pygame.draw.line(grad_surf, col, (x, 1), (x, grad_h - 2))
-
-        # Máscara para manter o mesmo raio 11 do retângulo
-        mask = pygame.Surface((grad_w, grad_h), pygame.SRCALPHA)
-        pygame.draw.rect(mask, (255, 255, 255, 255), mask.get_rect(), border_radius=11)
-        grad_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    if grad_w > 0 and grad_h > 0 and in_layer(layer, "dynamic"):
+        grad_surf = gradients.hgradient((grad_w, grad_h), SOC_COLOR_STOPS, 11, inset_y=1)
 
         # Nível do SOC (0..1) — renderiza só até essa fração
         level = max(0.0, min(1.0, float(getattr(data, "soc", 0.0))))
         level_w = int(grad_w * level)
         if level_w > 0:
-            surface.blit(
-                grad_surf.subsurface((0, 0, level_w, grad_h)),
-                (bar_rect.left + 1, bar_rect.top + 1)
-            )
+            surface.blit(grad_surf, (bar_rect.left + 1, bar_rect.top + 1), area=(0, 0, level_w, grad_h))
 
     # ----------------- Divisórias (mesmas do SVG) -----------------
+    if not in_layer(layer, "foreground"):
+        return
     # No SVG a barra tem largura útil 322px (x=1..323). As retas estão em:
     svg_ticks = [33.9321, 65.8641, 97.7961, 129.728, 161.66, 193.592, 225.524, 257.456, 289.388]
     # Escala para a largura atual de 320px (ret.width), preservando a referência (x-1)
@@ -288,41 +311,47 @@ def draw_soc(surface, data, pos=(342,473), size=(320,110)):
 
 
 # ---- Temperaturas (caixa direita superior) ----
-def _draw_temp_gauge(surface, rect, value, vmin, vmax, icon_surf, max_label, min_label="20°"):
+def _draw_temp_gauge(surface, rect, value, vmin, vmax, icon_surf, max_label, min_label="20°", layer="all"):
     """Gauge vertical com labels FIXOS nas laterais e preenchimento por valor."""
     # ícone acima
-    if icon_surf:
+    if icon_surf and in_layer(layer, "background"):
         surface.blit(icon_surf, icon_surf.get_rect(centerx=rect.centerx, top=rect.top - 4))
 
     # barra
     bar_rect = pygame.Rect(rect.x + rect.width // 4, rect.y + 20, rect.width // 2, rect.height - 50)
-    pygame.draw.rect(surface, (40, 40, 40), bar_rect, border_radius=10)
-
-    ratio = max(0.0, min(1.0, (value - vmin) / max(1e-6, (vmax - vmin))))
-    fill_h = int((bar_rect.height - 8) * ratio)
-    fill_rect = pygame.Rect(bar_rect.x + 4, bar_rect.bottom - 4 - fill_h, bar_rect.width - 8, fill_h)
-
-    # gradiente de baixo (0) para cima (1)
-    for i in range(max(fill_rect.height, 0)):
-        t = i / max(1, fill_rect.height - 1)
-        color = _color_from_stops(TEMP_COLOR_STOPS, t)
-        y = fill_rect.bottom - 1 - i
-        pygame.draw.line(surface, color, (fill_rect.left, y), (fill_rect.right - 1, y))
-
-    pygame.draw.rect(surface, (60, 60, 60), bar_rect, width=2, border_radius=10)
-
-    # labels fixos laterais (não mudam)
-    max_s = FONTS["temp_labels"].render(max_label, True, COLORS["temp_red"])
-    surface.blit(max_s, max_s.get_rect(midleft=(bar_rect.right + 14, bar_rect.top + 2)))
-    c_top = FONTS["temp_labels"].render("C", True, COLORS["temp_red"])
-    surface.blit(c_top, c_top.get_rect(midleft=(bar_rect.right + 14, bar_rect.top + 18)))
-
-    min_s = FONTS["temp_labels"].render(min_label, True, COLORS["white"])
-    surface.blit(min_s, min_s.get_rect(midright=(bar_rect.left - 14, bar_rect.bottom - 2)))
-    c_bot = FONTS["temp_labels"].render("C", True, COLORS["white"])
-    surface.blit(c_bot, c_bot.get_rect(midright=(bar_rect.left - 14, bar_rect.bottom - 18)))
-
-def draw_temperatures_box(surface, data, pos=(833,129), size=(157,189)):
+    if in_layer(layer, "background"):
+        pygame.draw.rect(surface, (40, 40, 40), bar_rect, border_radius=10)
+
+    if in_layer(layer, "dynamic"):
+        ratio = max(0.0, min(1.0, (value - vmin) / max(1e-6, (vmax - vmin))))
+        fill_h = int((bar_rect.height - 8) * ratio)
+        fill_rect = pygame.Rect(bar_rect.x + 4, bar_rect.bottom - 4 - fill_h, bar_rect.width - 8, fill_h)
+
+        # gradiente da escala inteira, de baixo (0) para cima (1): mostra só a parte alcançada
+        full_h = bar_rect.height - 8
+        grad = gradients.vgradient((fill_rect.width, full_h), TEMP_COLOR_STOPS)
+        surface.blit(grad, fill_rect, area=(0, full_h - fill_h, fill_rect.width, fill_h))
+
+    if in_layer(layer, "foreground"):
+        pygame.draw.rect(surface, (60, 60, 60), bar_rect, width=2, border_radius=10)
+
+    if layer == "dynamic":
+        return
+    # labels fixos laterais (não mudam). Os labels do gauge da direita cobrem o
+    # contorno do gauge da esquerda; na camada de cima eles só são aplicados
+    # onde já há contorno, para manter a mesma ordem de pintura.
+    blit = surface.blit if layer != "foreground" else (lambda src, r: _blit_over_opaque(surface, src, r))
+    max_s = TEXT.render("temp_labels", max_label, COLORS["temp_red"])
+    blit(max_s, max_s.get_rect(midleft=(bar_rect.right + 14, bar_rect.top + 2)))
+    c_top = TEXT.render("temp_labels", "C", COLORS["temp_red"])
+    blit(c_top, c_top.get_rect(midleft=(bar_rect.right + 14, bar_rect.top + 18)))
+
+    min_s = TEXT.render("temp_labels", min_label, COLORS["white"])
+    blit(min_s, min_s.get_rect(midright=(bar_rect.left - 14, bar_rect.bottom - 2)))
+    c_bot = TEXT.render("temp_labels", "C", COLORS["white"])
+    blit(c_bot, c_bot.get_rect(midright=(bar_rect.left - 14, bar_rect.bottom - 18)))
+
+def draw_temperatures_box(surface, data, pos=(833,129), size=(157,189), layer="all"):
     """Caixa de temperaturas (bateria à esquerda, motor à direita)."""
     rect = pygame.Rect(pos, (size[0], int(size[1])))
     # sem borda (mock mostra a caixa "limpa"); se quiser, adicione:
@@ -331,14 +360,20 @@ def draw_temperatures_box(surface, data, pos=(833,129), size=(157,189)):
     left  = pygame.Rect(rect.x, rect.y, rect.width // 2, rect.height)
     right = pygame.Rect(rect.centerx, rect.y, rect.width // 2, rect.height)
 
-    _draw_temp_gauge(surface, left,  data.battery_temp, 20, 60,  IMAGES.get("battery_temp"), "60°")
-    _draw_temp_gauge(surface, right, data.engine_temp,  20, 110, IMAGES.get("engine_temp"),  "110°")
+    dynamic = in_layer(layer, "dynamic")
+    _draw_temp_gauge(surface, left,  data.battery_temp if dynamic else None, 20, 60,
+                     IMAGES.get("battery_temp"), "60°", layer=layer)
+    _draw_temp_gauge(surface, right, data.engine_temp if dynamic else None,  20, 110,
+                     IMAGES.get("engine_temp"),  "110°", layer=layer)
 
 # ---- Sistema de alertas (caixa esquerda inferior) ----
-def draw_alerts(surface, data, pos=(50,305), size=(133,267)):
+def draw_alerts(surface, data, pos=(50,305), size=(133,267), layer="all"):
     rect = pygame.Rect(pos, size)
-    pygame.draw.rect(surface, COLORS["background"], rect, border_radius=15)
-    pygame.draw.rect(surface, COLORS["border_red"], rect, width=2, border_radius=15)
+    if in_layer(layer, "background"):
+        pygame.draw.rect(surface, COLORS["background"], rect, border_radius=15)
+        pygame.draw.rect(surface, COLORS["border_red"], rect, width=2, border_radius=15)
+    if not in_layer(layer, "dynamic"):
+        return
 
     # 4 slots em grid 2x2
     cells = [
@@ -348,7 +383,8 @@ def draw_alerts(surface, data, pos=(50,305), size=(133,267)):
         (rect.x + rect.width*0.75, rect.y + rect.height*0.75),
     ]
     icon_map = {"bms":"bms","inverter":"inverter","battery":"battery_fault","engine":"engine_fault"}
-    for i, (name, is_faulty) in enumerate(data.faults.items()):
+    for i, name in enumerate(FAULTS):
+        is_faulty = data.fault(name)
         cx, cy = cells[i]
         badge = pygame.Rect(0,0,56,44); badge.center = (int(cx), int(cy))
         pygame.draw.rect(surface, (60,60,60) if not is_faulty else COLORS["pedal_red"], badge, border_radius=8)
@@ -356,7 +392,7 @@ def draw_alerts(surface, data, pos=(50,305), size=(133,267)):
         if img:
             surface.blit(img, img.get_rect(center=badge.center))
         else:
-            label = FONTS["alert_text"].render(name.upper(), True, (255,255,255))
+            label = TEXT.render("alert_text", name.upper(), (255,255,255))
             surface.blit(label, label.get_rect(center=badge.center))
 
 # ---- Pneus (barras com stroke branco e linhas internas) ----
@@ -367,11 +403,14 @@ def _tyre_fill_color_by_temp(t):
     if t < 95:     return (0xBA, 0xA0, 0x17)  # amarelo
     return (0xFF, 0x00, 0x04)                 # vermelho
 
-def draw_tyre_bar(surface, x, y, w=40, h=82, temp=50):
+def draw_tyre_bar(surface, x, y, w=40, h=82, temp=50, layer="all"):
     """Desenha a barra do pneu como no SVG fornecido."""
     rect = pygame.Rect(x, y, w, h)
     # preenchimento pela temperatura
-    pygame.draw.rect(surface, _tyre_fill_color_by_temp(temp), rect, border_radius=5)
+    if in_layer(layer, "dynamic"):
+        pygame.draw.rect(surface, _tyre_fill_color_by_temp(temp), rect, border_radius=5)
+    if not in_layer(layer, "foreground"):
+        return
     # stroke branco
     pygame.draw.rect(surface, COLORS["white"], rect, width=1, border_radius=5)
     # linhas horizontais internas nas mesmas posições do SVG
@@ -384,39 +423,36 @@ def draw_tyre_data_block(surface, topleft, temp, psi, align="center"):
     bx, by = topleft
     w, h = 67, 69
     # não desenha caixa — apenas textos como no mock
-    t_text = FONTS["tyre_info"].render(f"{int(temp)}°C", True, COLORS["white"])
-    p_text = FONTS["tyre_info"].render(f"{int(psi)}PSI", True, COLORS["white"])
+    t_text = TEXT.render("tyre_info", f"{int(temp)}°C", COLORS["white"])
+    p_text = TEXT.render("tyre_info", f"{int(psi)}PSI", COLORS["white"])
     cx = bx + w//2
     surface.blit(t_text, t_text.get_rect(center=(cx, by + 20)))
     surface.blit(p_text, p_text.get_rect(center=(cx, by + 46)))
 
-def draw_tyres_fixed(surface, data):
-    # FL
-    draw_tyre_bar(surface, 302, 100, 40, 82, data.tyre_data['FL']['temp'])
-    label = FONTS["tyre_loc"].render("FL", True, COLORS["white"])
-    surface.blit(label, label.get_rect(midbottom=(302+20, 100-6)))
-    draw_tyre_data_block(surface, (236, 100), data.tyre_data['FL']['temp'], data.tyre_data['FL']['pressure'])
-
-    # FR
-    draw_tyre_bar(surface, 662, 100, 40, 82, data.tyre_data['FR']['temp'])
-    label = FONTS["tyre_loc"].render("FR", True, COLORS["white"])
-    surface.blit(label, label.get_rect(midbottom=(662+20, 100-6)))
-    draw_tyre_data_block(surface, (709, 106), data.tyre_data['FR']['temp'], data.tyre_data['FR']['pressure'])
-
-    # RL
-    draw_tyre_bar(surface, 302, 430, 40, 82, data.tyre_data['RL']['temp'])
-    label = FONTS["tyre_loc"].render("RL", True, COLORS["white"])
-    surface.blit(label, label.get_rect(midbottom=(302+20, 430-6)))
-    draw_tyre_data_block(surface, (228, 430), data.tyre_data['RL']['temp'], data.tyre_data['RL']['pressure'])
-
-    # RR
-    draw_tyre_bar(surface, 662, 430, 40, 82, data.tyre_data['RR']['temp'])
-    label = FONTS["tyre_loc"].render("RR", True, COLORS["white"])
-    surface.blit(label, label.get_rect(midbottom=(662+20, 430-6)))
-    draw_tyre_data_block(surface, (709, 435), data.tyre_data['RR']['temp'], data.tyre_data['RR']['pressure'])
+# (código, x/y da barra, topo-esquerda do bloco de dados)
+TYRE_SLOTS = (
+    ("FL", (302, 100), (236, 100)),
+    ("FR", (662, 100), (709, 106)),
+    ("RL", (302, 430), (228, 430)),
+    ("RR", (662, 430), (709, 435)),
+)
+
+def draw_tyre(surface, data, code, bar, block, layer="all"):
+    x, y = bar
+    temp = data.tyre_temp(code) if in_layer(layer, "dynamic") else None
+    draw_tyre_bar(surface, x, y, 40, 82, temp, layer=layer)
+    if in_layer(layer, "background"):
+        label = TEXT.render("tyre_loc", code, COLORS["white"])
+        surface.blit(label, label.get_rect(midbottom=(x+20, y-6)))
+    if in_layer(layer, "dynamic"):
+        draw_tyre_data_block(surface, block, temp, data.tyre_pressure(code))
+
+def draw_tyres_fixed(surface, data, layer="all"):
+    for code, bar, block in TYRE_SLOTS:
+        draw_tyre(surface, data, code, bar, block, layer=layer)
 
 # ---- Pedais (caixa 94x168 em 833,341) ----
-def draw_pedals_box(surface, data, pos=(833,341), size=(94,168)):
+def draw_pedals_box(surface, data, pos=(833,341), size=(94,168), layer="all"):
     rect = pygame.Rect(pos, size)
     # caixa "limpa" (mock não mostra borda)
     bar_w = 28
@@ -426,15 +462,18 @@ def draw_pedals_box(surface, data, pos=(833,341), size=(94,168)):
     # F (freio) à direita
     f_rect = pygame.Rect(rect.right - 12 - bar_w, rect.bottom - bar_h, bar_w, bar_h)
 
-    # rótulos A/F no topo
-    a_lbl = FONTS["pedal_letters"].render("A", True, COLORS["pedal_green"])
-    f_lbl = FONTS["pedal_letters"].render("F", True, COLORS["pedal_red"])
-    surface.blit(a_lbl, a_lbl.get_rect(center=(a_rect.centerx, rect.top + 6)))
-    surface.blit(f_lbl, f_lbl.get_rect(center=(f_rect.centerx, rect.top + 6)))
+    if in_layer(layer, "background"):
+        # rótulos A/F no topo
+        a_lbl = TEXT.render("pedal_letters", "A", COLORS["pedal_green"])
+        f_lbl = TEXT.render("pedal_letters", "F", COLORS["pedal_red"])
+        surface.blit(a_lbl, a_lbl.get_rect(center=(a_rect.centerx, rect.top + 6)))
+        surface.blit(f_lbl, f_lbl.get_rect(center=(f_rect.centerx, rect.top + 6)))
 
-    # molduras
-    pygame.draw.rect(surface, (60,60,60), a_rect, border_radius=12)
-    pygame.draw.rect(surface, (60,60,60), f_rect, border_radius=12)
+        # molduras
+        pygame.draw.rect(surface, (60,60,60), a_rect, border_radius=12)
+        pygame.draw.rect(surface, (60,60,60), f_rect, border_radius=12)
+    if not in_layer(layer, "dynamic"):
+        return
 
     # preenchimentos
     a_h = int(bar_h * (data.accelerator/100))
@@ -445,40 +484,66 @@ def draw_pedals_box(surface, data, pos=(833,341), size=(94,168)):
 # ---- RPM box (já implementada acima), Laps (acima), SOC (acima) ----
 
 # ---- Logo ----
-def draw_logo(surface, pos=(919,503)):
+def draw_logo(surface, pos=(919,503), layer="all"):
     img = IMAGES.get("logo_utforce")
-    if img:
+    if img and in_layer(layer, "background"):
         surface.blit(img, img.get_rect(topleft=pos))
 
-# ---- Função principal de desenho (layout 1024x600 fixo) ----
+# ---- Widgets + layout 1024x600 ----
+def _draw_rpm_box_widget(surface, data, layer="all", **kw):
+    draw_rpm_box(surface, data.rpm if data else None, layer=layer, **kw)
+
+# (nome, função, área na tela, campos exibidos -> quantizador, parâmetros de desenho).
+# As áreas não se sobrepõem, então a imagem guardada de cada widget só depende dele.
+# O círculo vai em três faixas para não pegar os cantos onde ficam as barras dos pneus
+# (o "Km/h" pode passar da borda direita do círculo).
+register("v2.speed_circle", draw_speed_circle,
+         [(343, 115, 318, 68), (326, 183, 380, 247), (343, 430, 318, 43)],
+         {"rpm": lambda rpm: int(round(64 * clamp01(rpm / 12000.0))),  # segmentos acesos
+          "speed": None, "mode": None},
+         pos=(326, 115), size=(356, 356))
+# números de 5 dígitos passam um pouco da borda da caixa
+register("v2.rpm_box", _draw_rpm_box_widget, (347, 3, 310, 106), ("rpm",), pos=(353, 3), size=(298, 106))
+register("v2.laps", draw_laps, (28, 74, 178, 206), ("lap_ms",), pos=(28, 74), size=(178, 206))
+register("v2.soc", draw_soc, (342, 473, 320, 110),
+         {"soc": lambda soc: int(318 * clamp01(float(soc))),
+          "power_delta": lambda pd: f"{pd:.1f}"},
+         pos=(342, 473), size=(320, 110))
+register("v2.temperatures", draw_temperatures_box, (833, 129, 157, 189), ("battery_temp", "engine_temp"),
+         pos=(833, 129), size=(157, 189))
+register("v2.alerts", draw_alerts, (50, 305, 133, 267), ("fault_bits",), pos=(50, 305), size=(133, 267))
+for _i, (_code, _bar, _block) in enumerate(TYRE_SLOTS):
+    # textos largos ("100°C") passam um pouco da largura do bloco
+    _area = pygame.Rect(_bar, (40, 82)).union(pygame.Rect(_block, (67, 69)).inflate(16, 0))
+    register("v2.tyre_" + _code, draw_tyre, _area,
+             {"tyre_temps": lambda ts, i=_i: int(ts[i]), "tyre_pressures": lambda ps, i=_i: int(ps[i])},
+             code=_code, bar=_bar, block=_block)
+del _i, _code, _bar, _block, _area
+register("v2.pedals", draw_pedals_box, (833, 341, 94, 168), ("accelerator", "brake"),
+         pos=(833, 341), size=(94, 168))
+register("v2.logo", lambda surface, data, **kw: draw_logo(surface, **kw), pos=(919, 503))
+
+LAYOUT = Layout({
+    "name": "v2",
+    "size": (1024, 600),
+    "background": COLORS["background"],
+    "widgets": ["v2.speed_circle", "v2.rpm_box", "v2.laps", "v2.soc", "v2.temperatures", "v2.alerts",
+                "v2.tyre_FL", "v2.tyre_FR", "v2.tyre_RL", "v2.tyre_RR", "v2.pedals", "v2.logo"],
+    "boot": ["v2.speed_circle", "v2.logo"],
+})
+LAYERS = LAYOUT.layers
+DIRTY = LAYOUT.dirty
+
+# ---- Camadas estáticas (cache) ----
+def invalidate_layers():
+    """Descarta as camadas estáticas; serão recompostas no próximo draw_all."""
+    LAYOUT.invalidate()
+
+def build_layers(surface):
+    """Compõe uma única vez o fundo estático e a sobreposição estática no formato de `surface`."""
+    LAYOUT.build_layers(surface)
+
+# ---- Função principal de desenho ----
 def draw_all(surface, data):
-    surface.fill(COLORS["background"])
-
-    # Círculo velocidade + anel RPM
-    draw_speed_circle(surface, data, pos=(326,115), size=(356,356))
-
-    # Caixa RPM
-    draw_rpm_box(surface, data.rpm, pos=(353,3), size=(298,106))
-
-    # Voltas
-    draw_laps(surface, data, pos=(28,74), size=(178,206))
-
-    # SOC
-    draw_soc(surface, data, pos=(342,473), size=(320,110))
-
-    # Temperaturas (bateria/motor)
-    draw_temperatures_box(surface, data, pos=(833,129), size=(157,189))
-
-    # Alertas
-    draw_alerts(surface, data, pos=(50,305), size=(133,267))
-
-    # Pneus + blocos de dados
-    draw_tyres_fixed(surface, data)
-
-    # Pedais
-    draw_pedals_box(surface, data, pos=(833,341), size=(94,168))
-
-    # Logo
-    draw_logo(surface, pos=(919,503))
-
-    pygame.display.flip()
+    """Atualiza o frame em `surface` e devolve os retângulos que mudaram (para display.update)."""
+    return LAYOUT.draw_all(surface, data)
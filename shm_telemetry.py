@@ -0,0 +1,328 @@
+# shm_telemetry.py
+# Barramento de telemetria em memória compartilhada: um processo produtor faz a
+# aquisição (simulador, replay, UDP ou CAN) e publica o frame mais novo; qualquer
+# número de leitores (painel, gravador, streamer) mapeia o mesmo segmento.
+#   python shm_telemetry.py --hz 200                       # produtor com o simulador
+#   python shm_telemetry.py --can socketcan:can0 --hz 500  # produtor lendo o CAN
+#   python main\ rendererv2.py --shm                       # painel, em outro processo
+#   python shm_telemetry.py --record volta.tlm             # gravador, em outro processo
+import argparse
+import ctypes
+import os
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+
+from telemetry_frame import TelemetryFrame
+
+MAGIC = b"UTFSHM01"
+VERSION = 1
+DEFAULT_NAME = "utforce_telemetry"
+
+class BusHeader(ctypes.LittleEndianStructure):
+    """Cabeçalho do segmento (64 bytes); o anel de slots vem logo depois."""
+    _fields_ = [
+        ("magic",      ctypes.c_char * 8),
+        ("version",    ctypes.c_uint32),
+        ("frame_size", ctypes.c_uint32),
+        ("seq",        ctypes.c_uint64),   # publicações completas; a k-ésima está no slot k % capacity
+        ("writing",    ctypes.c_uint64),   # publicação em andamento
+        ("capacity",   ctypes.c_uint32),   # slots no anel
+        ("pid",        ctypes.c_uint32),   # processo produtor
+        ("updated",    ctypes.c_double),   # time.time() da última publicação
+        ("_reserved",  ctypes.c_uint8 * 16),
+    ]
+
+class BusSlot(ctypes.LittleEndianStructure):
+    _fields_ = [
+        ("frame", TelemetryFrame),
+        ("crc",   ctypes.c_uint32),   # crc32 do frame
+        ("_pad",  ctypes.c_uint32),
+    ]
+
+HEADER_SIZE = ctypes.sizeof(BusHeader)
+FRAME_SIZE = ctypes.sizeof(TelemetryFrame)
+SLOT_SIZE = ctypes.sizeof(BusSlot)
+# ~1 s a 256 Hz: quanto um leitor que só grava (read_new) pode atrasar sem perder frames
+DEFAULT_CAPACITY = 256
+# tentativas de leitura antes de desistir do frame da vez (fica o anterior)
+READ_RETRIES = 100
+
+def segment_size(capacity):
+    return HEADER_SIZE + capacity * SLOT_SIZE
+
+# segmentos criados por este processo (o resource_tracker cuida deles)
+_OWNED = set()
+
+def _attach(name):
+    """Abre um segmento existente sem registrá-lo no resource_tracker (senão ele
+    seria apagado quando este leitor saísse, por baixo do produtor)."""
+    shm = shared_memory.SharedMemory(name=name)
+    if name not in _OWNED:
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+class TelemetryBus:
+    """
+    Lado do produtor. publish() é um seqlock sobre um anel de `capacity` slots:
+    marca `writing`, copia o frame (e o crc32 dele) para o slot seguinte e só então
+    avança `seq`. Quem lê nunca trava o produtor, e um produtor parado no meio de
+    uma escrita (preempção) não trava quem lê: os slots anteriores continuam
+    íntegros. O crc cobre CPUs com ordem de memória fraca (ARM), onde Python não
+    tem como pôr barreiras. Um segmento que sobrou de um produtor que morreu é
+    reaproveitado.
+    """
+    def __init__(self, name=DEFAULT_NAME, capacity=DEFAULT_CAPACITY):
+        if capacity < 2:
+            raise ValueError("capacity deve ser >= 2")
+        self.name = name
+        self.capacity = capacity
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=segment_size(capacity))
+            _OWNED.add(name)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            header = BusHeader.from_buffer_copy(self._shm.buf, 0)
+            if self._shm.size < segment_size(capacity) or header.capacity not in (0, capacity):
+                self._shm.close()
+                raise ValueError(f"{name}: já existe um segmento com outro formato")
+        self.published = 0
+        self._header = BusHeader.from_buffer(self._shm.buf, 0)
+        self._slots = (BusSlot * capacity).from_buffer(self._shm.buf, HEADER_SIZE)
+        self._base = ctypes.addressof(self._slots)
+        header = self._header
+        header.writing = header.seq  # o produtor anterior pode ter morrido no meio de uma escrita
+        header.magic = MAGIC
+        header.version = VERSION
+        header.frame_size = FRAME_SIZE
+        header.capacity = capacity
+        header.pid = os.getpid()
+
+    def publish(self, frame):
+        header = self._header
+        n = header.seq + 1
+        i = n % self.capacity
+        header.writing = n
+        ctypes.memmove(self._base + i * SLOT_SIZE, ctypes.addressof(frame), FRAME_SIZE)
+        slot = self._slots[i]
+        slot.crc = zlib.crc32(slot.frame)
+        header.updated = time.time()
+        header.seq = n
+        self.published += 1
+
+    def close(self, unlink=True):
+        if self._shm is None:
+            return
+        # as views ctypes seguram o buffer: soltam antes do close()
+        self._header = self._slots = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+            _OWNED.discard(self.name)
+        self._shm = None
+
+class SharedTelemetryProvider(TelemetryFrame):
+    """
+    Lado do leitor, com a mesma interface do DataProvider (update() / snapshot() /
+    campos do frame). update() copia só o frame mais novo, e só quando o `seq` do
+    segmento mudou; uma leitura rasgada (o produtor deu a volta no anel até o slot
+    lido ou o crc não bate) é refeita e, se não fechar em READ_RETRIES tentativas,
+    o frame anterior continua na tela. read_new() entrega todos os frames
+    publicados desde a última leitura, para quem grava.
+    """
+    def __init__(self, name=DEFAULT_NAME):
+        super().__init__()
+        self.name = name
+        try:
+            self._shm = _attach(name)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{name}: nenhum produtor publicando (rode o shm_telemetry.py)") from None
+        self._header = BusHeader.from_buffer(self._shm.buf, 0)
+        header = self._header
+        if header.magic != MAGIC or header.frame_size != FRAME_SIZE:
+            self.close()
+            raise ValueError(f"{name}: não é um barramento de telemetria compatível")
+        self.capacity = header.capacity
+        self._base = ctypes.addressof(self._header) + HEADER_SIZE
+        self._scratch = TelemetryFrame()
+        self._seen = 0     # seq 0 = nada publicado ainda
+        self.reads = 0     # frames novos copiados
+        self.retries = 0   # leituras refeitas por colisão com o produtor
+        self.torn = 0      # frames desistidos depois de READ_RETRIES
+        self.skipped = 0   # frames que read_new() perdeu por atrasar mais que o anel
+
+    def _read(self, k):
+        """Copia a k-ésima publicação para o frame de trabalho; False se ela já foi sobrescrita."""
+        addr = self._base + (k % self.capacity) * SLOT_SIZE
+        scratch = self._scratch
+        ctypes.memmove(ctypes.addressof(scratch), addr, FRAME_SIZE)
+        crc = ctypes.c_uint32.from_address(addr + FRAME_SIZE).value
+        # o slot só é reescrito pela publicação k + capacity
+        return self._header.writing < k + self.capacity and zlib.crc32(scratch) == crc
+
+    def _show(self, k):
+        ctypes.memmove(ctypes.addressof(self), ctypes.addressof(self._scratch), FRAME_SIZE)
+        self._seen = k
+        self.reads += 1
+
+    def update(self):
+        header = self._header
+        for _ in range(READ_RETRIES):
+            seq = header.seq
+            if seq == self._seen:
+                return
+            if self._read(seq):
+                self._show(seq)
+                return
+            self.retries += 1
+        self.torn += 1
+
+    def read_new(self):
+        """
+        Gera cada frame publicado desde a última leitura, em ordem (o mesmo frame
+        de trabalho a cada passo: use/copie antes do próximo). Se o leitor atrasou
+        mais que o anel, os mais antigos são contados em `skipped`.
+        """
+        seq = self._header.seq
+        start = self._seen + 1
+        oldest = seq - self.capacity + 2  # o slot de seq - capacity + 1 pode estar sendo escrito
+        if start < oldest:
+            if self._seen:
+                self.skipped += oldest - start
+            start = oldest
+        for k in range(max(start, 1), seq + 1):
+            if self._read(k):
+                self._show(k)
+                yield self._scratch
+            else:
+                self.skipped += 1
+
+    def snapshot(self):
+        return self.copy()
+
+    def stats(self):
+        header = self._header
+        return {
+            "reads": self.reads,
+            "retries": self.retries,
+            "torn": self.torn,
+            "skipped": self.skipped,
+            "published": header.seq,
+            "producer_pid": header.pid,
+            # idade da última publicação: produtor parado/morto aparece aqui
+            "age_s": time.time() - header.updated if header.updated else None,
+        }
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._header = None
+        self._shm.close()
+        self._shm = None
+
+    stop = close
+
+def serve(source, bus, hz=200.0, seconds=0.0, report_every=5.0):
+    """Produtor: source.update() + publish() a `hz` por `seconds` (0 = até Ctrl+C)."""
+    period = 1.0 / hz
+    start = next_t = last_report = time.perf_counter()
+    last_count = 0
+    try:
+        while not seconds or next_t - start < seconds:
+            source.update()
+            bus.publish(source)
+            now = time.perf_counter()
+            if report_every and now - last_report >= report_every:
+                rate = (bus.published - last_count) / (now - last_report)
+                print(f"[shm_telemetry] {rate:7.0f} frames/s -> {bus.name}")
+                last_report, last_count = now, bus.published
+            next_t += period
+            delay = next_t - now
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.1:
+                next_t = now
+    except KeyboardInterrupt:
+        pass
+    return bus.published
+
+def record(name, path, hz=50.0, seconds=0.0, overwrite=False):
+    """Leitor: grava todos os frames do barramento num TelemetryRecorder, esvaziando o anel a `hz`."""
+    from telemetry_log import TelemetryRecorder
+    reader = SharedTelemetryProvider(name)
+    try:
+        recorder = TelemetryRecorder(path, overwrite=overwrite)
+    except BaseException:
+        reader.close()
+        raise
+    period = 1.0 / hz
+    start = time.perf_counter()
+    written = 0
+    try:
+        while not seconds or time.perf_counter() - start < seconds:
+            for frame in reader.read_new():
+                recorder.write(frame)
+                written += 1
+            time.sleep(period)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+        reader.close()
+    return written
+
+def _open_source(args):
+    if args.replay:
+        from data_provider import ReplayProvider
+        return ReplayProvider(args.replay, rate=1.0, loop=True)
+    if args.udp:
+        from udp_telemetry import UdpTelemetryProvider
+        host, _, port = args.udp.rpartition(":")
+        return UdpTelemetryProvider(host or "0.0.0.0", int(port)).start()
+    if args.can:
+        from can_telemetry import CanTelemetryProvider, DEFAULT_SIGNALS, load_dbc, open_source
+        signals = load_dbc(args.can_dbc) if args.can_dbc else DEFAULT_SIGNALS
+        return CanTelemetryProvider(open_source(args.can), signals).start()
+    from data_provider import DataProvider, FixedStepProvider
+    return FixedStepProvider(DataProvider())
+
+def main():
+    parser = argparse.ArgumentParser(description="Barramento de telemetria em memória compartilhada")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="nome do segmento")
+    parser.add_argument("--hz", type=float, default=200.0, help="taxa de publicação (com --record: quantas vezes por segundo esvazia o anel)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY,
+                        help="frames no anel (quanto um gravador pode atrasar sem perder frames)")
+    parser.add_argument("--seconds", type=float, default=0.0, help="duração (0 = até Ctrl+C)")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="publica um log gravado em vez do simulador")
+    parser.add_argument("--udp", metavar="[HOST:]PORTA", help="publica a telemetria recebida por UDP")
+    parser.add_argument("--can", metavar="FONTE", help="publica a telemetria do CAN (socketcan:can0 ou log)")
+    parser.add_argument("--can-dbc", metavar="ARQUIVO", help="mapa de sinais (DBC) para --can")
+    parser.add_argument("--record", metavar="ARQUIVO",
+                        help="não publica: lê o barramento de outro produtor e grava neste arquivo")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="com --record: sobrescreve o arquivo se ele já existir")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.overwrite and os.path.exists(args.record):
+            parser.error(f"{args.record} já existe (use --overwrite para sobrescrever)")
+        n = record(args.name, args.record, args.hz, args.seconds, args.overwrite)
+        print(f"[shm_telemetry] {n} frames gravados em {args.record}")
+        return
+
+    source = _open_source(args)
+    bus = TelemetryBus(args.name, args.capacity)
+    print(f"[shm_telemetry] publicando em {args.name} a {args.hz:.0f} Hz (pid {os.getpid()})")
+    try:
+        n = serve(source, bus, args.hz, args.seconds)
+    finally:
+        bus.close()
+        if hasattr(source, "stop"):
+            source.stop()
+    print(f"[shm_telemetry] {n} frames publicados")
+
+if __name__ == "__main__":
+    main()
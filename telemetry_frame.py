@@ -0,0 +1,115 @@
+# telemetry_frame.py
+import ctypes
+
+# ordem fixa dos pneus / falhas / voltas dentro do frame
+TYRES = ("FL", "FR", "RL", "RR")
+FAULTS = ("bms", "inverter", "battery", "engine")
+LAPS = ("best", "previous", "current")
+
+TYRE_INDEX = {code: i for i, code in enumerate(TYRES)}
+FAULT_BIT = {name: 1 << i for i, name in enumerate(FAULTS)}
+LAP_INDEX = {key: i for i, key in enumerate(LAPS)}
+
+def format_lap_ms(ms):
+    """85123 -> "1:25:123" (mesmo formato de lap_data)."""
+    m, rest = divmod(int(ms), 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{m}:{s:02d}:{ms:03d}"
+
+def parse_lap_time(text):
+    """"1:25:123" -> 85123."""
+    m, s, ms = (int(p) for p in text.split(":"))
+    return (m * 60 + s) * 1000 + ms
+
+class TelemetryFrame(ctypes.LittleEndianStructure):
+    """
+    Um frame de telemetria com layout binário fixo (little-endian). Os campos são
+    lidos/escritos direto no buffer do frame; bytes(frame) / memoryview(frame)
+    exportam e TelemetryFrame.from_bytes() embrulha um buffer sem cópia, então o
+    mesmo frame serve para trocar entre threads, gravar em log ou mandar pela rede.
+    """
+    _fields_ = [
+        ("seq",           ctypes.c_uint32),
+        ("fault_bits",    ctypes.c_uint32),
+        ("timestamp",     ctypes.c_double),
+        ("rpm",           ctypes.c_int32),
+        ("speed",         ctypes.c_int32),
+        ("accelerator",   ctypes.c_int32),
+        ("brake",         ctypes.c_int32),
+        ("soc",           ctypes.c_double),
+        ("power_delta",   ctypes.c_double),
+        ("battery_temp",  ctypes.c_double),
+        ("engine_temp",   ctypes.c_double),
+        ("tyre_temps",    ctypes.c_double * 4),
+        ("tyre_pressures", ctypes.c_double * 4),
+        ("lap_ms",        ctypes.c_int32 * 3),
+        ("_mode",         ctypes.c_char * 24),
+    ]
+
+    @classmethod
+    def from_bytes(cls, buf, offset=0):
+        """Frame sobre `buf` sem cópia se o buffer for gravável; senão, uma cópia."""
+        view = memoryview(buf)
+        if view.readonly:
+            return cls.from_buffer_copy(view, offset)
+        return cls.from_buffer(view, offset)
+
+    def to_bytes(self):
+        return bytes(self)
+
+    def copy(self):
+        """Snapshot independente (um memcpy do frame)."""
+        return TelemetryFrame.from_buffer_copy(self)
+
+    def values(self, *names):
+        """Tupla com os campos pedidos (arrays viram tuplas), boa para comparar entre frames."""
+        out = []
+        for name in names:
+            v = getattr(self, name)
+            out.append(tuple(v) if isinstance(v, ctypes.Array) else v)
+        return tuple(out)
+
+    # ---- modo ----
+    @property
+    def mode(self):
+        # bytes inválidos (rede, log corrompido) viram "\ufffd": o painel nunca cai por isso
+        return self._mode.decode("utf-8", errors="replace")
+
+    @mode.setter
+    def mode(self, text):
+        self._mode = text.encode("utf-8")
+
+    # ---- pneus ----
+    def tyre_temp(self, code):
+        return self.tyre_temps[TYRE_INDEX[code]]
+
+    def tyre_pressure(self, code):
+        return self.tyre_pressures[TYRE_INDEX[code]]
+
+    # ---- falhas (bitmask) ----
+    def fault(self, name):
+        return bool(self.fault_bits & FAULT_BIT[name])
+
+    def set_fault(self, name, on):
+        if on:
+            self.fault_bits |= FAULT_BIT[name]
+        else:
+            self.fault_bits &= ~FAULT_BIT[name]
+
+    # ---- voltas ----
+    def lap_time(self, key):
+        return format_lap_ms(self.lap_ms[LAP_INDEX[key]])
+
+    # ---- visões no formato antigo (dicts), para código que ainda espera isso ----
+    @property
+    def tyre_data(self):
+        return {code: {'temp': self.tyre_temps[i], 'pressure': self.tyre_pressures[i]}
+                for i, code in enumerate(TYRES)}
+
+    @property
+    def lap_data(self):
+        return {key: format_lap_ms(self.lap_ms[i]) for i, key in enumerate(LAPS)}
+
+    @property
+    def faults(self):
+        return {name: bool(self.fault_bits & bit) for name, bit in FAULT_BIT.items()}
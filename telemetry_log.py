@@ -0,0 +1,179 @@
+# telemetry_log.py
+import ctypes
+import errno
+import mmap
+import os
+import threading
+
+from telemetry_frame import TelemetryFrame
+
+MAGIC = b"UTFTLM01"
+VERSION = 1
+FLAG_CLEAN = 1  # gravado no close(); ausente = sessão interrompida (crash)
+
+class LogHeader(ctypes.LittleEndianStructure):
+    """Cabeçalho fixo no início do arquivo (64 bytes)."""
+    _fields_ = [
+        ("magic",      ctypes.c_char * 8),
+        ("version",    ctypes.c_uint32),
+        ("frame_size", ctypes.c_uint32),
+        ("capacity",   ctypes.c_uint64),
+        ("count",      ctypes.c_uint64),   # total de frames já gravados (não volta a zero)
+        ("flags",      ctypes.c_uint32),
+        ("_reserved",  ctypes.c_uint8 * 28),
+    ]
+
+HEADER_SIZE = ctypes.sizeof(LogHeader)
+FRAME_SIZE = ctypes.sizeof(TelemetryFrame)
+
+def _preallocate(f, size):
+    """
+    Reserva os blocos do arquivo no disco. Só com truncate() ele fica esparso: o
+    primeiro write() em cada página do mmap aloca bloco no meio do render, e com o
+    disco cheio o processo morre com SIGBUS em vez de o erro aparecer aqui.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                raise
+    # sem fallocate (Windows/macOS, ou o sistema de arquivos não suporta): zeros de verdade
+    chunk = bytes(1 << 20)
+    f.seek(0)
+    for offset in range(0, size, len(chunk)):
+        f.write(chunk[:size - offset])
+    f.flush()
+
+class TelemetryRecorder:
+    """
+    Grava TelemetryFrames num arquivo pré-alocado e mapeado em memória, usado como
+    buffer circular de `capacity` frames (os mais antigos são sobrescritos). O
+    padrão cobre 30 min a 200 Hz (~60 MB).
+
+    write() é um memcpy para o slot da vez seguido do incremento de `count` no
+    cabeçalho, nessa ordem: se o processo morrer no meio, o frame incompleto fica
+    fora da janela válida. O msync para o disco roda numa thread própria a cada
+    `sync_interval` segundos, nunca no loop de render.
+
+    O arquivo é alocado inteiro na criação. Um arquivo que já existe não é
+    sobrescrito (FileExistsError), a não ser com `overwrite=True`.
+    """
+    def __init__(self, path, capacity=30 * 60 * 200, sync_interval=1.0, overwrite=False):
+        if capacity < 2:
+            raise ValueError("capacity deve ser >= 2")
+        self.path = path
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        size = HEADER_SIZE + capacity * FRAME_SIZE
+        self._file = open(path, "w+b" if overwrite else "x+b")
+        try:
+            _preallocate(self._file, size)
+        except BaseException:
+            self._file.close()
+            os.unlink(path)  # não deixa um log pela metade para trás
+            raise
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self._header = LogHeader.from_buffer(self._mm, 0)
+        # a view segura o export do mmap; write() copia direto para o endereço dela
+        self._frames = (TelemetryFrame * capacity).from_buffer(self._mm, HEADER_SIZE)
+        self._base = ctypes.addressof(self._frames)
+        self._header.magic = MAGIC
+        self._header.version = VERSION
+        self._header.frame_size = FRAME_SIZE
+        self._header.capacity = capacity
+        self._mm.flush()
+
+        self._stop = threading.Event()
+        self._sync_thread = None
+        if sync_interval:
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="telemetry-sync", daemon=True)
+            self._sync_thread.start()
+
+    def write(self, frame):
+        """Acrescenta `frame` (um TelemetryFrame ou DataProvider). O(1), sem alocar buffers."""
+        header = self._header
+        # memmove e não self._frames[i] = frame: a atribuição do ctypes guarda um dict por slot
+        ctypes.memmove(self._base + (header.count % self.capacity) * FRAME_SIZE,
+                       ctypes.addressof(frame), FRAME_SIZE)
+        header.count += 1
+
+    @property
+    def count(self):
+        return self._header.count
+
+    def sync(self):
+        self._mm.flush()
+
+    def _sync_loop(self):
+        while not self._stop.wait(self.sync_interval):
+            self._mm.flush()
+
+    def close(self):
+        if self._mm is None:
+            return
+        self._stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+        self._header.flags |= FLAG_CLEAN
+        self._mm.flush()
+        # solta as views ctypes antes de fechar o mmap
+        del self._header, self._frames
+        self._mm.close()
+        self._file.close()
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TelemetryLog:
+    """
+    Leitura de um arquivo do TelemetryRecorder. Os frames são indexados em ordem
+    cronológica (0 = mais antigo ainda no buffer); cada um é uma cópia de 168
+    bytes lida do mmap, então continua válida depois de close().
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = LogHeader.from_buffer_copy(self._mm, 0)
+        if header.magic != MAGIC:
+            raise ValueError(f"{path}: não é um log de telemetria")
+        if header.version != VERSION or header.frame_size != FRAME_SIZE:
+            raise ValueError(f"{path}: versão/layout de frame incompatível "
+                             f"(v{header.version}, {header.frame_size} bytes)")
+        self.capacity = header.capacity
+        self.total = header.count
+        self.clean = bool(header.flags & FLAG_CLEAN)
+        # o slot seguinte ao último pode estar pela metade num crash: fica de fora
+        self._len = min(self.total, self.capacity - 1)
+        self._first = self.total - self._len
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        slot = (self._first + i) % self.capacity
+        return TelemetryFrame.from_buffer_copy(self._mm, HEADER_SIZE + slot * FRAME_SIZE)
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self[i]
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
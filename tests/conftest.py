@@ -0,0 +1,19 @@
+# conftest.py
+# Os módulos do painel ficam soltos na raiz do repositório; os testes rodam sem janela.
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+@pytest.fixture
+def display():
+    """pygame com uma tela de 1x1 (formato de pixel para convert_alpha / bake)."""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
@@ -0,0 +1,55 @@
+# test_asset_bundle.py
+import gc
+
+import pygame
+import pytest
+
+import asset_bundle
+import renderer
+import rendererv2
+
+@pytest.fixture
+def bundle_path(display, tmp_path):
+    path = str(tmp_path / "assets.bundle")
+    specs = list(renderer.IMAGE_SPECS.values()) + list(rendererv2.IMAGE_SPECS.values())
+    asset_bundle.bake(specs, path)
+    return path
+
+def test_bake_pads_entries_and_tail(bundle_path):
+    bundle = asset_bundle.AssetBundle(bundle_path)
+    size = len(bundle._mm)
+    assert size % asset_bundle._PAGE == 0
+    for e in bundle.entries.values():
+        assert e.offset % asset_bundle._ALIGN == 0
+        # a última entrada não termina colada no fim do arquivo
+        assert e.offset + e.nbytes + asset_bundle._ALIGN <= size
+    bundle.close()
+
+def test_images_outlive_the_bundle(bundle_path):
+    reference = {}
+    for _ in range(50):
+        bundle = asset_bundle.AssetBundle(bundle_path)
+        images = {name: bundle.image(*_split(name)) for name in bundle.entries}
+        bundle.close()
+        del bundle
+        gc.collect()
+        for name, surf in images.items():
+            assert surf is not None, name
+            pixels = pygame.image.tobytes(surf, "RGBA")
+            expected = reference.setdefault(name, pygame.image.tobytes(asset_bundle.load_png(*_split(name)), "RGBA"))
+            assert pixels == expected, name
+
+@pytest.mark.parametrize("module", [renderer, rendererv2])
+def test_load_assets_from_bundle_repeatedly(bundle_path, monkeypatch, module):
+    monkeypatch.setattr(asset_bundle, "open_bundle", lambda: asset_bundle.AssetBundle(bundle_path))
+    for _ in range(20):
+        module.load_assets()
+        gc.collect()
+        surface = pygame.Surface((1024, 600))
+        for surf in module.IMAGES.values():
+            surface.blit(surf, (0, 0))
+
+def _split(name):
+    """"arquivo@LxA" -> (arquivo, (L, A)); sem "@" -> (arquivo, None)."""
+    filename, _, size = name.partition("@")
+    return filename, tuple(int(v) for v in size.split("x")) if size else None
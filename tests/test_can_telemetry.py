@@ -0,0 +1,134 @@
+# test_can_telemetry.py
+import pytest
+
+from can_telemetry import (DEFAULT_SIGNALS, CandumpSource, CanTelemetryProvider, compile_decoders,
+                           encode_signals, load_dbc, signal)
+from telemetry_frame import TelemetryFrame
+
+def _decode(signals, can_id, data):
+    frame = TelemetryFrame()
+    compile_decoders(signals)[can_id](frame, data)
+    return frame
+
+# ---- round trip encode_signals -> compile_decoders ----
+@pytest.mark.parametrize("sig, values", [
+    (signal("rpm", 0x10, 0, 16), [0, 1, 5617, 65535]),                              # Intel
+    (signal("rpm", 0x10, 4, 12), [0, 0x123, 4095]),                                 # Intel, fora do byte
+    (signal("rpm", 0x10, 7, 16, little_endian=False), [0, 0x1234, 65535]),          # Motorola
+    (signal("rpm", 0x10, 3, 12, little_endian=False), [0, 0x55A, 4095]),            # Motorola, fora do byte
+    (signal("rpm", 0x10, 8, 16, signed=True), [-32768, -1, 0, 32767]),              # Intel com sinal
+    (signal("rpm", 0x10, 23, 16, little_endian=False, signed=True), [-32768, -200, 0, 32767]),
+])
+def test_round_trip(sig, values):
+    for value in values:
+        data = encode_signals([sig], {"rpm": value})[0x10]
+        assert _decode([sig], 0x10, data).rpm == value, (value, data.hex())
+
+def test_default_signals_round_trip():
+    values = {"rpm": 7311, "speed": 123, "accelerator": 80, "brake": 3, "soc": 0.5432,
+              "power_delta": -12.34, "battery_temp": -5.5, "engine_temp": -20.0, "fault_bms": 1,
+              "fault_engine": 1, "tyre_temp_FL": 85.2, "tyre_pressure_RR": 1.75}
+    frame = TelemetryFrame()
+    decoders = compile_decoders(DEFAULT_SIGNALS)
+    for can_id, data in encode_signals(DEFAULT_SIGNALS, values).items():
+        decoders[can_id](frame, data)
+    assert (frame.rpm, frame.speed, frame.accelerator, frame.brake) == (7311, 123, 80, 3)
+    for name in ("soc", "power_delta", "battery_temp", "engine_temp"):
+        assert getattr(frame, name) == pytest.approx(values[name]), name
+    assert frame.tyre_temps[0] == pytest.approx(85.2)
+    assert frame.tyre_pressures[3] == pytest.approx(1.75)
+    assert frame.fault("bms") and frame.fault("engine")
+    assert not frame.fault("battery") and not frame.fault("inverter")
+
+# ---- vetores calculados à mão ----
+def test_motorola_vector():
+    # engine_temp: @0 (Motorola), start 7 (MSB do byte 0), 16 bits, com sinal, x0.1
+    assert _decode(DEFAULT_SIGNALS, 0x201, bytes([0x12, 0x34, 0, 0])).engine_temp == pytest.approx(466.0)
+    assert _decode(DEFAULT_SIGNALS, 0x201, bytes([0xFF, 0x38, 0, 0])).engine_temp == pytest.approx(-20.0)
+    # start 3: 4 bits baixos do byte 0 (MSB) + byte 1 inteiro
+    sig = signal("rpm", 0x10, 3, 12, little_endian=False)
+    assert _decode([sig], 0x10, bytes([0xA5, 0x5A])).rpm == 0x55A
+
+def test_intel_vector():
+    sig = signal("rpm", 0x10, 4, 12)
+    assert _decode([sig], 0x10, bytes([0x30, 0x12])).rpm == 0x123
+
+def test_scale_and_offset():
+    sig = signal("battery_temp", 0x10, 0, 8, scale=0.5, offset=-40.0)
+    assert _decode([sig], 0x10, bytes([100])).battery_temp == pytest.approx(10.0)
+    assert encode_signals([sig], {"battery_temp": 10.0})[0x10][0] == 100
+
+def test_short_frame_keeps_previous_value():
+    signals = [signal("rpm", 0x10, 0, 16), signal("speed", 0x10, 16, 16),
+               signal("accelerator", 0x10, 7, 16, little_endian=False)]
+    decode = compile_decoders(signals)[0x10]
+    frame = TelemetryFrame()
+    decode(frame, bytes([0x10, 0x00, 0x20, 0x00]))
+    assert (frame.rpm, frame.speed, frame.accelerator) == (16, 32, 0x1000)
+    decode(frame, bytes([0x11, 0x00]))  # DLC 2: o speed (bytes 2-3) não veio
+    assert (frame.rpm, frame.speed, frame.accelerator) == (17, 32, 0x1100)
+    decode(frame, bytes([0x12]))        # DLC 1: nenhum sinal inteiro
+    assert (frame.rpm, frame.speed, frame.accelerator) == (17, 32, 0x1100)
+
+# ---- DBC ----
+DBC = """VERSION ""
+
+BO_ 256 VCU_1: 8 VCU
+ SG_ rpm : 0|16@1+ (1,0) [0|20000] "rpm" DASH
+ SG_ power_delta : 16|16@1- (0.01,0) [-300|300] "kW" DASH
+ SG_ unknown_signal : 32|8@1+ (1,0) [0|255] "" DASH
+
+BO_ 2147484161 VCU_EXT: 8 VCU
+ SG_ engine_temp : 7|16@0- (0.1,-40) [-40|200] "C" DASH
+
+CM_ SG_ 256 rpm "rotação do motor";
+"""
+
+def test_load_dbc(tmp_path):
+    path = tmp_path / "vcu.dbc"
+    path.write_text(DBC, encoding="latin-1")
+    signals = {s.name: s for s in load_dbc(str(path))}
+    assert set(signals) == {"rpm", "power_delta", "unknown_signal", "engine_temp"}
+    assert signals["rpm"] == signal("rpm", 256, 0, 16)
+    assert signals["power_delta"] == signal("power_delta", 256, 16, 16, 0.01, signed=True)
+    # ID estendido: o bit 31 do DBC sai do can_id
+    assert signals["engine_temp"] == signal("engine_temp", 0x201, 7, 16, 0.1, -40.0,
+                                            little_endian=False, signed=True)
+    # sinal sem campo no frame não gera decodificador, mas não atrapalha os outros
+    frame = _decode(list(signals.values()), 256, bytes([0x10, 0x27, 0x18, 0xFC, 0xFF, 0, 0, 0]))
+    assert frame.rpm == 10000
+    assert frame.power_delta == pytest.approx(-10.0)
+
+# ---- candump ----
+def test_candump_parsing(tmp_path):
+    path = tmp_path / "can.log"
+    path.write_text(
+        "(1700000000.000000) can0 100#1027000000000000\n"
+        "(1700000000.001000) can0 201#FF38\n"
+        "isto não é um frame\n"
+        "(1700000000.002000) can0 100#R\n"
+        "(1700000000.003000) can0 12345678#\n"
+        "(1700000000.004000) can0 101##0112\n"
+    )
+    source = CandumpSource(str(path), rate=0)
+    try:
+        batch = source.read_batch(16)
+        assert batch == [
+            (1700000000.0, 0x100, bytes.fromhex("1027000000000000")),
+            (1700000000.001, 0x201, bytes([0xFF, 0x38])),
+            (1700000000.003, 0x12345678, b""),
+        ]
+        assert source.skipped == 3  # lixo, remote frame e CAN FD
+        assert source.read_batch(16) is None
+    finally:
+        source.close()
+
+    provider = CanTelemetryProvider(CandumpSource(str(path), rate=0))
+    try:
+        assert provider.decode_batch(batch) == 2
+        assert provider.unknown == 1
+        assert provider._work.rpm == 10000
+        assert provider._work.engine_temp == pytest.approx(-20.0)
+        assert provider._work.timestamp == 1700000000.003
+    finally:
+        provider.source.close()
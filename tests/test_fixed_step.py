@@ -0,0 +1,59 @@
+# test_fixed_step.py
+import random
+
+import pytest
+
+from data_provider import DataProvider, FixedStepProvider
+
+FIELDS = ("seq", "rpm", "speed", "accelerator", "brake", "soc", "power_delta",
+          "battery_temp", "engine_temp", "tyre_temps", "fault_bits")
+
+def _run(fps, seconds=60, **kwargs):
+    random.seed(1)
+    p = FixedStepProvider(DataProvider(), **kwargs)
+    for _ in range(fps * seconds):
+        p.update(1.0 / fps)
+    return p
+
+@pytest.mark.parametrize("fps", [15, 30, 60, 144, 240])
+def test_same_steps_at_any_fps(fps):
+    p = _run(fps)
+    assert p.steps == 60 * DataProvider.SIM_HZ
+    assert p.sim.timestamp - p.sim_time == 0.0
+    assert p.sim.values(*FIELDS) == _run(DataProvider.SIM_HZ).sim.values(*FIELDS)
+
+def test_stall_drops_time_instead_of_bursting():
+    p = FixedStepProvider(DataProvider(), max_substeps=8)
+    p.update(2.0)
+    assert p.steps == 8
+    # o que não coube nos 8 passos é descartado; só a fração de um passo fica no acumulado
+    assert p.accumulator < 1 / DataProvider.SIM_HZ + 1e-9
+    assert p.dropped + p.accumulator == pytest.approx(2.0 - 8 / DataProvider.SIM_HZ)
+
+def test_interpolated_fields_stay_between_steps():
+    random.seed(1)
+    p = FixedStepProvider(DataProvider())
+    for _ in range(144):
+        p.update(1.0 / 144)
+        lo, hi = sorted((p._prev.soc, p.sim.soc))
+        assert lo - 1e-12 <= p.soc <= hi + 1e-12
+
+def test_negative_dt_counts_as_no_time():
+    random.seed(1)
+    p = FixedStepProvider(DataProvider())
+    p.update(0.5 / DataProvider.SIM_HZ)
+    p.update(-1.0)
+    assert p.accumulator == pytest.approx(0.5 / DataProvider.SIM_HZ)
+    assert p.steps == 0
+    # o próximo passo vem no tempo normal, sem ter de "pagar" o dt negativo
+    p.update(0.5 / DataProvider.SIM_HZ)
+    assert p.steps == 1
+
+def test_clock_going_backwards():
+    times = iter([10.0, 9.0, 9.0 + 1.0 / DataProvider.SIM_HZ])
+    p = FixedStepProvider(DataProvider(), clock=lambda: next(times))
+    p.update()
+    p.update()
+    assert (p.steps, p.accumulator) == (0, 0.0)
+    p.update()
+    assert p.steps == 1
@@ -0,0 +1,52 @@
+# test_rpm_ring.py
+import math
+
+import pygame
+import pytest
+
+import gradients
+import rendererv2
+
+CENTER = (504, 293)  # geometria do draw_speed_circle do layout
+RADIUS = 178
+SEGMENTS = 64
+
+def _legacy_draw_rpm_ring(surface, lit, center, radius, thickness=16):
+    """O desenho de antes do sprite: 6 linhas por segmento, cor calculada a cada frame."""
+    inner = radius - thickness
+    phase_deg = 90.0
+    for i in range(SEGMENTS):
+        a0 = i * (360.0 / SEGMENTS) + phase_deg
+        a1 = (i+1) * (360.0 / SEGMENTS) + phase_deg
+        color = gradients._color_at(rendererv2.RING_COLOR_STOPS, i / max(SEGMENTS-1, 1))
+        seg_color = color if i < lit else (60, 60, 60)
+        steps = 6
+        for s in range(steps):
+            ang = math.radians(a0 + (a1 - a0) * (s/steps))
+            x0 = center[0] + inner * math.cos(ang)
+            y0 = center[1] + inner * math.sin(ang)
+            x1 = center[0] + radius * math.cos(ang)
+            y1 = center[1] + radius * math.sin(ang)
+            pygame.draw.line(surface, seg_color, (x0, y0), (x1, y1), 3)
+
+def test_palette_sprite_matches_line_drawing_in_every_state(display):
+    rendererv2.RING_SPRITES.clear()
+    expected = pygame.Surface((1024, 600))
+    actual = pygame.Surface((1024, 600))
+    # sobe e desce, para pegar também a troca de paleta nos dois sentidos
+    for lit in list(range(SEGMENTS + 1)) + list(range(SEGMENTS, -1, -1)):
+        expected.fill((12, 34, 56))
+        actual.fill((12, 34, 56))
+        _legacy_draw_rpm_ring(expected, lit, CENTER, RADIUS)
+        rpm = lit * 12000 / SEGMENTS  # ratio exato: round(64 * ratio) == lit
+        rendererv2.draw_rpm_ring(actual, rpm, 12000, CENTER, RADIUS)
+        assert pygame.image.tobytes(actual, "RGB") == pygame.image.tobytes(expected, "RGB"), f"lit={lit}"
+
+@pytest.mark.parametrize("rpm", [-500, 0, 93, 6000, 11999, 12000, 15000])
+def test_out_of_range_rpm_is_clamped(display, rpm):
+    lit = int(round(SEGMENTS * max(0.0, min(1.0, rpm / 12000))))
+    expected = pygame.Surface((1024, 600))
+    actual = pygame.Surface((1024, 600))
+    _legacy_draw_rpm_ring(expected, lit, CENTER, RADIUS)
+    rendererv2.draw_rpm_ring(actual, rpm, 12000, CENTER, RADIUS)
+    assert pygame.image.tobytes(actual, "RGB") == pygame.image.tobytes(expected, "RGB")
@@ -0,0 +1,73 @@
+# test_telemetry_log.py
+import os
+
+import pytest
+
+from telemetry_frame import TelemetryFrame
+from telemetry_log import FRAME_SIZE, HEADER_SIZE, TelemetryLog, TelemetryRecorder
+
+def _frame(seq):
+    frame = TelemetryFrame()
+    frame.seq = seq
+    frame.rpm = seq * 3
+    frame.timestamp = seq / 200.0
+    return frame
+
+def _record(path, n, capacity, close=True, **kwargs):
+    recorder = TelemetryRecorder(str(path), capacity=capacity, sync_interval=0, **kwargs)
+    for seq in range(n):
+        recorder.write(_frame(seq))
+    if close:
+        recorder.close()
+    return recorder
+
+def test_reopen_wrapped_ring(tmp_path):
+    path = tmp_path / "volta.tlm"
+    _record(path, 1000, capacity=64)
+    with TelemetryLog(str(path)) as log:
+        assert (log.total, log.capacity, log.clean) == (1000, 64, True)
+        # o slot depois do último fica de fora (pode estar pela metade num crash)
+        assert len(log) == 63
+        seqs = [frame.seq for frame in log]
+        assert seqs == list(range(1000 - 63, 1000))
+        assert [log[i].rpm for i in (0, -1)] == [937 * 3, 999 * 3]
+        with pytest.raises(IndexError):
+            log[63]
+
+def test_reopen_before_wrap(tmp_path):
+    path = tmp_path / "volta.tlm"
+    _record(path, 10, capacity=64)
+    with TelemetryLog(str(path)) as log:
+        assert [frame.seq for frame in log] == list(range(10))
+
+def test_interrupted_session_is_not_clean(tmp_path):
+    path = tmp_path / "volta.tlm"
+    recorder = _record(path, 100, capacity=64, close=False)
+    recorder.sync()
+    with TelemetryLog(str(path)) as log:
+        assert not log.clean
+        assert [frame.seq for frame in log] == list(range(37, 100))
+    recorder.close()
+
+def test_refuses_to_overwrite(tmp_path):
+    path = tmp_path / "volta.tlm"
+    _record(path, 10, capacity=64)
+    with pytest.raises(FileExistsError):
+        TelemetryRecorder(str(path), capacity=64, sync_interval=0)
+    with TelemetryLog(str(path)) as log:
+        assert log.total == 10  # continua intacto
+    _record(path, 3, capacity=32, overwrite=True)
+    with TelemetryLog(str(path)) as log:
+        assert (log.total, log.capacity) == (3, 32)
+
+@pytest.mark.skipif(not hasattr(os.stat_result, "st_blocks"), reason="sem st_blocks")
+def test_file_is_preallocated(tmp_path):
+    path = tmp_path / "volta.tlm"
+    recorder = TelemetryRecorder(str(path), capacity=20000, sync_interval=0)
+    try:
+        size = HEADER_SIZE + 20000 * FRAME_SIZE
+        st = os.stat(path)
+        assert st.st_size == size
+        assert st.st_blocks * 512 >= size  # não esparso
+    finally:
+        recorder.close()
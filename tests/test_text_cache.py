@@ -0,0 +1,64 @@
+# test_text_cache.py
+import numpy as np
+import pygame
+import pytest
+
+import renderer
+import rendererv2
+
+def _legacy_outlined(font, text, fg, outline, surface, center, width=2):
+    """O draw_text_with_outline de antes do cache: texto inteiro, 8 cópias do contorno + texto."""
+    txt = font.render(text, True, fg)
+    out = font.render(text, True, outline)
+    rect = txt.get_rect(center=center)
+    for dx in (-width, 0, width):
+        for dy in (-width, 0, width):
+            if dx != 0 or dy != 0:
+                surface.blit(out, rect.move(dx, dy))
+    surface.blit(txt, rect)
+
+@pytest.mark.parametrize("module", [renderer, rendererv2])
+@pytest.mark.parametrize("font_key, texts", [
+    ("rpm_num", ["1000", "1111", "5617", "7311", "8888", "10000", "11999"]),
+    ("speed_num", ["0", "14", "77", "100", "180"]),
+])
+def test_digit_mode_matches_whole_string_outline(display, module, font_key, texts):
+    module.load_assets()
+    fg, outline = module.COLORS["white"], module.COLORS["border_red"]
+    for text in texts:
+        expected = pygame.Surface((400, 160))
+        actual = pygame.Surface((400, 160))
+        expected.fill((26, 26, 26))
+        actual.fill((26, 26, 26))
+        _legacy_outlined(module.FONTS[font_key], text, fg, outline, expected, (200, 80))
+        module.OUTLINED.blit(actual, font_key, text, fg, outline, (200, 80), 2)
+        diff = np.abs(pygame.surfarray.array3d(expected).astype(int) - pygame.surfarray.array3d(actual).astype(int))
+        # só arredondamento da composição em alpha; o contorno de um dígito não pode
+        # cobrir a borda do vizinho (antes: até 60 níveis nas emendas)
+        assert diff.max() <= 3, (text, int(diff.max()))
+
+@pytest.mark.parametrize("module, font_key, text, fg, outline", [
+    (renderer, "speed_mode", "Endurance Mode", "grey", (255, 0, 4)),
+    (renderer, "rpm_unit", "RPM", "grey", (255, 0, 4)),
+    (renderer, "speed_unit", "Km/h", "white", (255, 0, 4)),
+    (rendererv2, "speed_mode", "Endurance Mode", "white", "border_red"),
+    (rendererv2, "rpm_unit", "RPM", "white", "border_red"),
+    (rendererv2, "speed_unit", "Km/h", "white", "border_red"),
+    (rendererv2, "soc_title", "SOC", "white", "border_red"),
+])
+@pytest.mark.parametrize("bg", [(26, 26, 26), (0, 0, 0)])
+def test_whole_string_matches_legacy_outline(display, module, font_key, text, fg, outline, bg):
+    module.load_assets()
+    fg = module.COLORS[fg]
+    outline = module.COLORS[outline] if isinstance(outline, str) else outline
+    expected = pygame.Surface((400, 160))
+    actual = pygame.Surface((400, 160))
+    expected.fill(bg)
+    actual.fill(bg)
+    _legacy_outlined(module.FONTS[font_key], text, fg, outline, expected, (200, 80))
+    module.OUTLINED.blit(actual, font_key, text, fg, outline, (200, 80), 2)
+    diff = np.abs(pygame.surfarray.array3d(expected).astype(int) - pygame.surfarray.array3d(actual).astype(int))
+    # as 8 cópias do contorno são somadas antes num sprite SRCALPHA e só depois
+    # misturadas com o fundo: sobra 1-2 níveis de arredondamento na borda suavizada
+    # (com o texto também dentro do sprite chegava a 10)
+    assert diff.max() <= 2, int(diff.max())
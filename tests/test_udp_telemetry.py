@@ -0,0 +1,86 @@
+# test_udp_telemetry.py
+import ctypes
+import socket
+import time
+
+import pytest
+
+from telemetry_frame import TelemetryFrame
+from udp_telemetry import (HEADER, PACKET_SIZE, REORDER_WINDOW, UdpTelemetryProvider,
+                           decode_packet, encode_packet, is_newer)
+
+MODE_OFFSET = len(HEADER) + TelemetryFrame._mode.offset
+
+def _frame(seq, mode="Endurance Mode"):
+    frame = TelemetryFrame()
+    frame.seq = seq
+    frame.rpm = 4321
+    frame.mode = mode
+    return frame
+
+# ---- is_newer ----
+def test_next_seq_is_newer():
+    assert is_newer(6, 5)
+    assert is_newer(5 + REORDER_WINDOW, 5)
+
+def test_duplicate_is_not_newer():
+    assert not is_newer(5, 5)
+
+def test_late_packet_within_window_is_not_newer():
+    assert not is_newer(4, 5)
+    assert not is_newer(5 + REORDER_WINDOW - (REORDER_WINDOW - 1), 5 + REORDER_WINDOW)
+
+def test_seq_wraparound():
+    assert is_newer(0, 2**32 - 1)
+    assert is_newer(10, 2**32 - 5)
+    assert not is_newer(2**32 - 1, 0)  # atrasado de antes da volta
+
+def test_sender_restart_is_accepted():
+    # VCU reiniciou: o seq volta para perto de zero, bem mais que a janela para trás
+    assert is_newer(1, 50_000)
+    assert is_newer(0, REORDER_WINDOW)
+
+# ---- decode_packet ----
+def test_round_trip():
+    frame = decode_packet(encode_packet(_frame(7)))
+    assert (frame.seq, frame.rpm, frame.mode) == (7, 4321, "Endurance Mode")
+
+@pytest.mark.parametrize("size", [0, len(HEADER), PACKET_SIZE - 1, PACKET_SIZE + 1])
+def test_wrong_length_is_rejected(size):
+    data = (encode_packet(_frame(1)) + b"\0")[:size]
+    assert decode_packet(data) is None
+
+def test_wrong_header_is_rejected():
+    data = b"XX" + encode_packet(_frame(1))[2:]
+    assert decode_packet(data) is None
+
+def test_garbage_mode_is_rejected():
+    data = bytearray(encode_packet(_frame(1)))
+    data[MODE_OFFSET:MODE_OFFSET + 4] = b"\xff\xfe\xc3\x28"
+    assert len(data) == PACKET_SIZE
+    assert decode_packet(bytes(data)) is None
+
+def test_garbage_mode_never_raises_when_read():
+    frame = _frame(1)
+    ctypes.memmove(ctypes.addressof(frame) + TelemetryFrame._mode.offset, b"\xff\xfe", 2)
+    assert frame.mode.startswith("�")
+
+def test_provider_drops_garbage_and_stale_packets():
+    provider = UdpTelemetryProvider("127.0.0.1", 0).start()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        bad = bytearray(encode_packet(_frame(100)))
+        bad[MODE_OFFSET] = 0xFF
+        for data in (encode_packet(_frame(10)), bytes(bad), encode_packet(_frame(9)),
+                     encode_packet(_frame(10)), encode_packet(_frame(11))):
+            sock.sendto(data, ("127.0.0.1", provider.port))
+        deadline = time.time() + 2.0
+        while provider.received < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        provider.update()
+        assert provider.stats() == {"received": 5, "accepted": 2, "dropped_invalid": 1, "dropped_stale": 2}
+        assert provider.seq == 11
+        assert provider.mode == "Endurance Mode"
+    finally:
+        sock.close()
+        provider.stop()
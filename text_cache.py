@@ -0,0 +1,127 @@
+# text_cache.py
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """
+    Cache LRU de textos renderizados, chaveado por (fonte, texto, cor, antialias).
+    `fonts` é o dicionário FONTS do renderer (consultado na hora do render, então
+    continua valendo depois de load_assets). As superfícies devolvidas são
+    compartilhadas: só blite, não desenhe nelas.
+    """
+    def __init__(self, fonts, maxsize=256):
+        self.fonts = fonts
+        self._items = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font_key, text, color, antialias=True):
+        key = (font_key, text, tuple(color), antialias)
+        surf = self._items.get(key)
+        if surf is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.fonts[font_key].render(text, antialias, color)
+        self._items[key] = surf
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return surf
+
+    def clear(self):
+        """Descarta tudo (ex.: fontes recarregadas); os contadores continuam."""
+        self._items.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+class OutlinedTextCache:
+    """
+    Sprites de contorno prontos (as 8 cópias numa superfície só), compostos uma vez
+    por (fonte, texto, cor do contorno, largura) e mantidos num LRU; em blit() o
+    texto (do TextCache) vai por cima direto no destino, como no desenho antigo. Com `digit_fonts`, números nessas fontes são montados a partir de um
+    sprite de contorno e um glifo por dígito, então o cache não cresce com cada
+    valor de RPM diferente.
+    """
+    def __init__(self, text_cache, maxsize=128, digit_fonts=()):
+        self._text = text_cache
+        self._items = OrderedDict()
+        self.maxsize = maxsize
+        self.digit_fonts = set(digit_fonts)
+        self.hits = 0
+        self.misses = 0
+
+    def _compose(self, font_key, text, fg_color, outline_color, width):
+        """fg_color None = só as 8 cópias do contorno (o texto é blitado depois, à parte)."""
+        out = self._text.render(font_key, text, outline_color)
+        w, h = out.get_size()
+        sprite = pygame.Surface((w + 2*width, h + 2*width), pygame.SRCALPHA)
+        for dx in (0, width, 2*width):
+            for dy in (0, width, 2*width):
+                if dx != width or dy != width:
+                    sprite.blit(out, (dx, dy))
+        if fg_color is not None:
+            sprite.blit(self._text.render(font_key, text, fg_color), (width, width))
+        return sprite
+
+    def render(self, font_key, text, fg_color, outline_color, width=2):
+        """Sprite com contorno; o texto fica deslocado de (width, width) dentro dele."""
+        key = (font_key, text, fg_color and tuple(fg_color), tuple(outline_color), width)
+        sprite = self._items.get(key)
+        if sprite is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        sprite = self._compose(font_key, text, fg_color, outline_color, width)
+        self._items[key] = sprite
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return sprite
+
+    def blit(self, surface, font_key, text, fg_color, outline_color, center, width=2):
+        """Desenha `text` centrado em `center` (mesmo posicionamento de font.render + get_rect)."""
+        if font_key in self.digit_fonts and text.isdigit():
+            self._blit_digits(surface, font_key, text, fg_color, outline_color, center, width)
+            return
+        # sprite só com o contorno e o texto blitado por cima, direto no destino: o texto
+        # misturado dentro do sprite em alpha saía até 10 níveis diferente do desenho antigo
+        sprite = self.render(font_key, text, None, outline_color, width)
+        rect = sprite.get_rect(center=center)
+        surface.blit(sprite, rect)
+        surface.blit(self._text.render(font_key, text, fg_color), (rect.x + width, rect.y + width))
+
+    def _blit_digits(self, surface, font_key, text, fg_color, outline_color, center, width):
+        font = self._text.fonts[font_key]
+        x = center[0] - font.size(text)[0] // 2 - width
+        y = center[1] - font.get_height() // 2 - width
+        # posição de cada dígito = largura do prefixo (respeita o avanço/kerning da fonte)
+        xs = [x + (font.size(text[:i])[0] if i else 0) for i in range(len(text))]
+        # todo o contorno primeiro e só então os dígitos, como no texto inteiro: o
+        # contorno de um dígito não cobre a borda suavizada do vizinho
+        for ch, px in zip(text, xs):
+            surface.blit(self.render(font_key, ch, None, outline_color, width), (px, y))
+        for ch, px in zip(text, xs):
+            surface.blit(self._text.render(font_key, ch, fg_color), (px + width, y + width))
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
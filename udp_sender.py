@@ -0,0 +1,80 @@
+# udp_sender.py
+# Faz o papel do carro: manda pacotes de telemetria por UDP para o painel.
+#   python udp_sender.py --hz 5000                      # simulador, 5 kHz, localhost:5005
+#   python udp_sender.py --replay volta.tlm --hz 200    # um log gravado com --record
+#   python udp_sender.py --hz 2000 --reorder 0.05 --duplicate 0.01 --drop 0.01
+# --reorder/--duplicate/--drop imitam uma rede ruim para exercitar o filtro por seq.
+import argparse
+import random
+import socket
+import time
+
+from data_provider import DataProvider, FixedStepProvider, ReplayProvider
+from udp_telemetry import DEFAULT_PORT, encode_packet
+
+def send(host="127.0.0.1", port=DEFAULT_PORT, hz=1000.0, seconds=0.0, replay=None,
+         reorder=0.0, duplicate=0.0, drop=0.0, seed=None, report_every=1.0):
+    """Manda pacotes a `hz` por `seconds` segundos (0 = até Ctrl+C); devolve quantos foram enviados."""
+    rng = random.Random(seed)
+    # o simulador anda por tempo: a taxa de pacotes não acelera o carro
+    source = ReplayProvider(replay, rate=0, loop=True) if replay else FixedStepProvider(DataProvider())
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    dest = (host, port)
+    period = 1.0 / hz
+    held = None  # pacote segurado para sair depois do seguinte (fora de ordem)
+    sent = 0
+    start = next_t = last_report = time.perf_counter()
+    last_sent = 0
+    try:
+        while not seconds or next_t - start < seconds:
+            source.update()
+            # seq é o número do pacote: o do log é o da gravação e o simulador só o
+            # avança a cada passo fixo, mas o receptor descarta seq repetido
+            source.seq = sent + 1
+            packet = encode_packet(source)
+            if rng.random() >= drop:
+                if held is None and rng.random() < reorder:
+                    held = packet
+                else:
+                    sock.sendto(packet, dest)
+                    if held is not None:
+                        sock.sendto(held, dest)
+                        held = None
+                    if rng.random() < duplicate:
+                        sock.sendto(packet, dest)
+            sent += 1
+
+            now = time.perf_counter()
+            if report_every and now - last_report >= report_every:
+                print(f"[udp_sender] {(sent - last_sent) / (now - last_report):8.0f} pacotes/s -> {host}:{port}")
+                last_report, last_sent = now, sent
+            next_t += period
+            delay = next_t - now
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.1:
+                next_t = now  # muito atrasado: não tenta recuperar com rajada
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+    return sent
+
+def main():
+    parser = argparse.ArgumentParser(description="Envia telemetria por UDP (substitui o VCU em testes)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--hz", type=float, default=1000.0, help="pacotes por segundo")
+    parser.add_argument("--seconds", type=float, default=0.0, help="duração (0 = até Ctrl+C)")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="envia um log gravado (--record) em vez do simulador")
+    parser.add_argument("--reorder", type=float, default=0.0, help="fração de pacotes trocados de ordem")
+    parser.add_argument("--duplicate", type=float, default=0.0, help="fração de pacotes enviados duas vezes")
+    parser.add_argument("--drop", type=float, default=0.0, help="fração de pacotes perdidos")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    sent = send(args.host, args.port, args.hz, args.seconds, args.replay,
+                args.reorder, args.duplicate, args.drop, args.seed)
+    print(f"[udp_sender] {sent} pacotes gerados")
+
+if __name__ == "__main__":
+    main()
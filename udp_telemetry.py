@@ -0,0 +1,148 @@
+# udp_telemetry.py
+import asyncio
+import ctypes
+import threading
+
+from telemetry_frame import TelemetryFrame
+
+# pacote = cabeçalho de 4 bytes + o TelemetryFrame cru (172 bytes no total)
+MAGIC = b"UT"
+VERSION = 1
+HEADER = MAGIC + bytes((VERSION, 0))
+HEADER_SIZE = len(HEADER)
+FRAME_SIZE = ctypes.sizeof(TelemetryFrame)
+PACKET_SIZE = HEADER_SIZE + FRAME_SIZE
+DEFAULT_PORT = 5005
+
+_SEQ_MOD = 1 << 32
+# quantos números de sequência para trás ainda contam como pacote atrasado; um
+# salto maior para trás é o VCU que reiniciou (seq voltou para perto de zero)
+REORDER_WINDOW = 1024
+
+def encode_packet(frame):
+    return HEADER + bytes(frame)
+
+def decode_packet(data):
+    """TelemetryFrame (cópia) do pacote, ou None se não for um pacote válido."""
+    if len(data) != PACKET_SIZE or data[:HEADER_SIZE] != HEADER:
+        return None
+    frame = TelemetryFrame.from_buffer_copy(data, HEADER_SIZE)
+    try:
+        frame._mode.decode("utf-8")
+    except UnicodeDecodeError:
+        return None  # modo que não é texto: pacote corrompido ou forjado
+    return frame
+
+def is_newer(seq, last):
+    """`seq` vem depois de `last`? Aritmética módulo 2**32 (o contador do VCU dá a volta)."""
+    behind = (last - seq) % _SEQ_MOD
+    # 0 = duplicado; 1..REORDER_WINDOW-1 = atrasado; o resto é mais novo (ou reinício)
+    return behind >= REORDER_WINDOW
+
+class _Receiver(asyncio.DatagramProtocol):
+    def __init__(self, provider):
+        self.provider = provider
+
+    def datagram_received(self, data, addr):
+        self.provider._receive(data)
+
+class UdpTelemetryProvider(TelemetryFrame):
+    """
+    Telemetria do VCU por UDP, com a mesma interface do DataProvider (update() /
+    snapshot() / campos do frame). Um endpoint asyncio numa thread própria recebe
+    os pacotes, descarta os inválidos, duplicados e atrasados (pelo `seq`) e
+    publica o mais novo trocando uma referência; update() só copia esse frame para
+    si, sem bloquear. Até o primeiro pacote os campos ficam zerados.
+    """
+    def __init__(self, host="0.0.0.0", port=DEFAULT_PORT):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.received = 0   # datagramas recebidos
+        self.accepted = 0   # publicados
+        self.dropped_invalid = 0
+        self.dropped_stale = 0
+        self._latest = None
+        self._shown = None
+        self._last_seq = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    # ---- thread de rede ----
+    def _receive(self, data):
+        self.received += 1
+        frame = decode_packet(data)
+        if frame is None:
+            self.dropped_invalid += 1
+            return
+        if self._last_seq is not None and not is_newer(frame.seq, self._last_seq):
+            self.dropped_stale += 1
+            return
+        self._last_seq = frame.seq
+        self._latest = frame  # troca de referência: atômica para quem lê
+        self.accepted += 1
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        self._stopped = loop.create_future()
+        try:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _Receiver(self), local_addr=(self.host, self.port))
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        # porta 0 = escolhida pelo sistema (testes)
+        self.port = transport.get_extra_info("sockname")[1]
+        self._ready.set()
+        try:
+            await self._stopped
+        finally:
+            transport.close()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+    def start(self):
+        """Abre a porta e começa a receber; levanta OSError se não conseguir abrir."""
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-udp", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        return self
+
+    def stop(self, timeout=1.0):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(lambda: self._stopped.done() or self._stopped.set_result(None))
+        self._thread.join(timeout)
+        self._thread = None
+
+    close = stop
+
+    # ---- lado do render ----
+    def update(self):
+        frame = self._latest
+        if frame is not None and frame is not self._shown:
+            ctypes.memmove(ctypes.addressof(self), ctypes.addressof(frame), FRAME_SIZE)
+            self._shown = frame
+
+    def snapshot(self):
+        return self.copy()
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "accepted": self.accepted,
+            "dropped_invalid": self.dropped_invalid,
+            "dropped_stale": self.dropped_stale,
+        }
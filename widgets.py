@@ -0,0 +1,189 @@
+# widgets.py
+import pygame
+from dirty_rects import DirtyTracker
+
+_MISSING = object()
+
+class Widget:
+    """
+    Um widget do painel: `draw(surface, data, layer=..., **params)` desenha e
+    `rect` é a área que o conteúdo dinâmico pode ocupar na tela (um retângulo ou
+    uma lista deles, para formas que não cabem num só sem invadir os vizinhos).
+
+    `fields` são os campos do TelemetryFrame que ele exibe: uma sequência de nomes
+    ou um dict nome -> quantizador, que reduz o valor ao que de fato aparece na
+    tela (ex.: int para temperatura em graus inteiros). Sem `fields` o widget é
+    só estático: entra nas camadas e nunca é redesenhado.
+    """
+    def __init__(self, name, draw, rect=None, fields=(), params=None):
+        self.name = name
+        self.draw = draw
+        rects = rect if isinstance(rect, list) else ([rect] if rect is not None else [])
+        self.rects = [pygame.Rect(r) for r in rects]
+        self.rect = self.rects[0].unionall(self.rects[1:]) if self.rects else None
+        self.fields = fields if isinstance(fields, dict) else dict.fromkeys(fields)
+        self.params = params or {}
+
+    @property
+    def dynamic(self):
+        return bool(self.fields)
+
+    def state(self, values):
+        """Os valores exibidos (já quantizados), a partir de {campo: valor} do frame."""
+        return tuple(values[f] if q is None else q(values[f]) for f, q in self.fields.items())
+
+# nome -> Widget (cada renderer registra os seus com prefixo "v1." / "v2.")
+REGISTRY = {}
+
+def register(name, draw, rect=None, fields=(), **params):
+    widget = Widget(name, draw, rect, fields, params)
+    REGISTRY[name] = widget
+    return widget
+
+class Layout:
+    """
+    Layout montado a partir de uma descrição {"name", "size", "background", "widgets": [nomes]}
+    (a ordem da lista é a ordem de desenho) e, opcionalmente, "boot": [nomes], os
+    widgets do frame mínimo mostrado enquanto os assets carregam. Guarda as camadas estáticas, o
+    DirtyTracker e a última imagem de cada widget, e a cada frame só redesenha os
+    widgets cujos valores exibidos mudaram.
+    """
+    def __init__(self, description, registry=REGISTRY):
+        self.name = description["name"]
+        self.size = tuple(description.get("size", (1024, 600)))
+        self.background = tuple(description["background"])
+        self.widgets = [registry[n] for n in description["widgets"]]
+        self.boot = [registry[n] for n in description.get("boot", ())]
+        self.dynamic = [w for w in self.widgets if w.dynamic]
+        self.fields = tuple(dict.fromkeys(f for w in self.dynamic for f in w.fields))
+        # vizinhos = widgets cujas áreas se sobrepõem (a imagem guardada de um inclui o outro)
+        self.neighbours = {
+            w.name: [n.name for n in self.dynamic
+                     if n is not w and any(a.colliderect(b) for a in w.rects for b in n.rects)]
+            for w in self.dynamic
+        }
+        self.layers = {}
+        self.dirty = DirtyTracker()
+        self._last_values = {}
+        self._cache = {}      # nome -> Surface com a última imagem do widget
+        self._valid = set()   # nomes cuja imagem guardada ainda é a da tela
+
+    def draw_boot(self, surface, data):
+        """Frame mínimo (fundo + widgets de "boot", inteiros), sem camadas nem cache; devolve os rects."""
+        surface.fill(self.background)
+        for w in self.boot:
+            w.draw(surface, data, layer="all", **w.params)
+        return [surface.get_rect()]
+
+    def draw_layer(self, surface, data, layer):
+        for w in self.widgets:
+            w.draw(surface, data, layer=layer, **w.params)
+
+    def invalidate(self):
+        self.layers.clear()
+
+    def build_layers(self, surface):
+        """Compõe uma única vez o fundo estático e a sobreposição estática no formato de `surface`."""
+        size = surface.get_size()
+        background = pygame.Surface(size, 0, surface)
+        background.fill(self.background)
+        self.draw_layer(background, None, "background")
+
+        foreground = pygame.Surface(size, pygame.SRCALPHA)
+        self.draw_layer(foreground, None, "foreground")
+
+        self.layers["size"] = size
+        self.layers["background"] = background
+        self.layers["foreground"] = foreground
+        # só as regiões com conteúdo são blitadas por cima
+        self.layers["foreground_rects"] = pygame.mask.from_surface(foreground).get_bounding_rects()
+        # camadas novas -> tudo é redesenhado (e as imagens guardadas não valem mais)
+        self._last_values = {}
+        self._cache.clear()
+        self._valid.clear()
+        self.dirty.invalidate(surface.get_rect())
+
+    def _changed_widgets(self, data):
+        """Compara o frame com o anterior campo a campo; só quantiza os widgets cujos campos mudaram."""
+        values = dict(zip(self.fields, data.values(*self.fields)))
+        last = self._last_values
+        changed_fields = {f for f, v in values.items() if last.get(f, _MISSING) != v}
+        self._last_values = values
+        if not changed_fields:
+            return []
+        return [w for w in self.dynamic
+                if not changed_fields.isdisjoint(w.fields)
+                and self.dirty.mark(w.name, w.rects, *w.state(values))]
+
+    def draw_all(self, surface, data):
+        """
+        Atualiza `surface` (que guarda o frame anterior) e devolve os retângulos
+        redesenhados, para display.update. Widgets com valores novos são
+        redesenhados; os outros que caem numa área suja (ex.: marcada com
+        dirty.add) são repostos da última imagem guardada, sem redesenhar.
+        """
+        if self.layers.get("size") != surface.get_size():
+            self.build_layers(surface)
+        changed = set(self._changed_widgets(data))
+        rects = self.dirty.pop()
+        if not rects:
+            return rects
+        for w in changed:
+            # a imagem guardada dele (e dos vizinhos, que a incluem) ficou velha
+            self._valid.discard(w.name)
+            self._valid.difference_update(self.neighbours[w.name])
+
+        # pop() devolve retângulos disjuntos: fundo e sobreposição vão num blits() só
+        background = self.layers["background"]
+        surface.blits([(background, r, r) for r in rects], doreturn=False)
+
+        restored = []
+        clip = surface.get_clip()
+        for w in self.dynamic:
+            if w in changed:
+                # a área inteira do widget já está suja: desenha uma vez, sem recorte
+                w.draw(surface, data, layer="dynamic", **w.params)
+                continue
+            hits = [r for r in rects if w.rect.colliderect(r)]
+            if not hits:
+                continue
+            if w.name in self._valid:
+                restored.append((w, hits))
+                continue
+            for r in hits:
+                surface.set_clip(r)
+                w.draw(surface, data, layer="dynamic", **w.params)
+            surface.set_clip(clip)
+
+        foreground = self.layers["foreground"]
+        pieces = []
+        for r in rects:
+            for fr in self.layers["foreground_rects"]:
+                piece = fr.clip(r)
+                if piece:
+                    pieces.append((foreground, piece, piece))
+        surface.blits(pieces, doreturn=False)
+
+        # imagens guardadas são o resultado final (com a sobreposição): vão por último
+        for w, hits in restored:
+            cache = self._cache[w.name]
+            for r in hits:
+                for own in w.rects:
+                    piece = own.clip(r)
+                    if piece:
+                        surface.blit(cache, piece, area=piece.move(-w.rect.x, -w.rect.y))
+
+        # a tela agora é o frame final inteiro: guarda quem está parado e ainda não tem imagem
+        # (quem muda todo frame nunca é copiado; seria redesenhado de qualquer jeito)
+        for w in self.dynamic:
+            if w not in changed and w.name not in self._valid:
+                self._store(surface, w)
+        return rects
+
+    def _store(self, surface, w):
+        cache = self._cache.get(w.name)
+        if cache is None:
+            cache = self._cache[w.name] = pygame.Surface(w.rect.size, 0, surface)
+        for own in w.rects:
+            cache.blit(surface, own.move(-w.rect.x, -w.rect.y), own)
+        self._valid.add(w.name)